@@ -18,17 +18,19 @@ def clear_console():
         os.system('clear')
 
 class AutoUpdater:
-    def __init__(self, repo_url: str = "https://github.com/RenjiYuusei/CursorFocus"):
+    def __init__(self, repo_url: str = "https://github.com/RenjiYuusei/CursorFocus", timeout: float = 5):
         self.repo_url = repo_url
+        # Seconds to wait on connect and between reads, so a stalled request can't hang exit
+        self.timeout = timeout
         self.api_url = repo_url.replace("github.com", "api.github.com/repos")
 
     def check_for_updates(self) -> Optional[Dict[str, Any]]:
         """Check update from latest update"""
         try:
             # Check commit latest
-            response = requests.get(f"{self.api_url}/commits/main")
+            response = requests.get(f"{self.api_url}/commits/main", timeout=self.timeout)
             if response.status_code == 404:  
-                response = requests.get(f"{self.api_url}/commits/master")
+                response = requests.get(f"{self.api_url}/commits/master", timeout=self.timeout)
             
             if response.status_code != 200:
                 return None
@@ -74,7 +76,7 @@ class AutoUpdater:
         """Update from latest commit."""
         try:
             # Download zip file of branch
-            response = requests.get(update_info['download_url'])
+            response = requests.get(update_info['download_url'], timeout=self.timeout)
             if response.status_code != 200:
                 return False
 
@@ -1,5 +1,44 @@
 import os
+import re
+import copy
 import json
+import stat
+import fnmatch
+import functools
+import tempfile
+
+@functools.lru_cache(maxsize=16)
+def _parse_config_file(config_path, mtime_ns, size):
+    """Parse a config file; cached per (path, mtime, size) so unchanged files are parsed once."""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_atomic(path, content):
+    """Write text or bytes to a file atomically so readers never see a partial file."""
+    directory, filename = os.path.split(path)
+    binary = isinstance(content, bytes)
+    # Same directory keeps os.replace on one filesystem, hence atomic
+    f = tempfile.NamedTemporaryFile(
+        'wb' if binary else 'w', encoding=None if binary else 'utf-8',
+        dir=directory or '.', prefix=f'.{filename}.', suffix='.tmp', delete=False
+    )
+    try:
+        with f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(f.name, mode)
+        os.replace(f.name, path)
+    except BaseException:
+        try:
+            os.unlink(f.name)
+        except FileNotFoundError:
+            pass
+        raise
 
 def load_config():
     """Load configuration from config.json."""
@@ -7,11 +46,13 @@ def load_config():
         script_dir = os.path.dirname(os.path.abspath(__file__))
         config_path = os.path.join(script_dir, 'config.json')
         
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                return json.load(f)
-        
-        return get_default_config()
+        try:
+            stat = os.stat(config_path)
+        except FileNotFoundError:
+            return get_default_config()
+
+        # Callers mutate the result, so hand out a copy of the cached parse
+        return copy.deepcopy(_parse_config_file(config_path, stat.st_mtime_ns, stat.st_size))
     except Exception as e:
         print(f"Error loading config: {e}")
         return None
@@ -21,6 +62,7 @@ def get_default_config():
     return {
         "project_path": "",
         "update_interval": 60,
+        "poll_fallback_interval": 5,
         "max_depth": 3,
         "ignored_directories": [
             "__pycache__",
@@ -70,6 +112,56 @@ def get_default_config():
         }
     }
 
+def compile_patterns(patterns):
+    """Compile glob patterns into a single regex, or None if there are none."""
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns))
+
+@functools.lru_cache(maxsize=32)
+def _build_ignore_matchers(ignored_directories, ignored_files, binary_extensions):
+    """Build matchers from tuples of patterns; cached because project configs repeat them."""
+    return (
+        frozenset(ignored_directories),
+        compile_patterns(ignored_files),
+        frozenset(binary_extensions)
+    )
+
+def _matchers_from_lists(config):
+    """Build the matchers from the config's own ignore lists."""
+    return _build_ignore_matchers(
+        tuple(config.get('ignored_directories', [])),
+        tuple(config.get('ignored_files', [])),
+        tuple(config.get('binary_extensions', []))
+    )
+
+def get_ignore_matchers(config):
+    """Get (ignored directory set, ignored file matcher, binary extension set) for a config.
+    
+    Uses the matchers attached by prepare_config() when present, otherwise
+    builds them on the fly without modifying the config.
+    """
+    if '_ignored_files_spec' in config:
+        return (
+            config['_ignored_directories'],
+            config['_ignored_files_spec'],
+            config['_binary_extensions']
+        )
+    return _matchers_from_lists(config)
+
+def prepare_config(config):
+    """Attach precompiled ignore matchers to a config dict so hot loops reuse them.
+    
+    Always rebuilt from the lists: a config merged from a prepared global
+    config carries the global matchers, which a project's lists may override.
+    """
+    ignored_directories, ignored_files_spec, binary_extensions = _matchers_from_lists(config)
+    config['_ignored_directories'] = ignored_directories
+    config['_ignored_files_spec'] = ignored_files_spec
+    config['_binary_extensions'] = binary_extensions
+    return config
+
 # Load configuration once at module level
 _config = load_config()
 
@@ -4,6 +4,7 @@ from analyzers import analyze_file_content, should_ignore_file, is_binary_file
 from project_detector import detect_project_type, get_project_description, get_file_type_info
 from config import (
     get_file_length_limit, 
+    get_ignore_matchers,
     load_config, 
     FUNCTION_PATTERNS,
     IGNORED_KEYWORDS,
@@ -13,6 +14,18 @@ from config import (
 import re
 import logging
 
+def _compile_function_patterns():
+    """Compile FUNCTION_PATTERNS once, skipping any that are not valid regexes."""
+    compiled = []
+    for pattern_name, pattern in FUNCTION_PATTERNS.items():
+        try:
+            compiled.append((pattern_name, re.compile(pattern)))
+        except re.error as e:
+            logging.debug(f"Invalid regex pattern {pattern_name}: {e}")
+    return compiled
+
+_FUNCTION_REGEXES = _compile_function_patterns()
+
 class ProjectMetrics:
     def __init__(self):
         self.total_files = 0
@@ -57,8 +70,11 @@ def generate_focus_content(project_path, config):
         "**Key Components:**"
     ]
     
+    # The tree, the file walk and focus.get_tree_fingerprint share these matchers
+    ignored_directories, ignored_files_spec, _ = get_ignore_matchers(config)
+
     # Add directory structure
-    structure = get_directory_structure(project_path, config['max_depth'])
+    structure = get_directory_structure(project_path, config['max_depth'], ignored_directories=ignored_directories)
     content.extend(structure_to_tree(structure))
     
     content.extend([
@@ -80,53 +96,50 @@ def generate_focus_content(project_path, config):
     
     # Analyze each file
     first_file = True
-    for root, _, files in os.walk(project_path):
-        if any(ignored in root.split(os.path.sep) for ignored in config['ignored_directories']):
+    for entry in walk_project_files(project_path, config['max_depth'], ignored_directories):
+        file = entry.name
+        if ignored_files_spec and ignored_files_spec.match(file):
             continue
             
-        for file in files:
-            if any(file.endswith(ignored.replace('*', '')) for ignored in config['ignored_files']):
-                continue
-                
-            file_path = os.path.join(root, file)
-            rel_path = os.path.relpath(file_path, project_path)
+        file_path = entry.path
+        rel_path = os.path.relpath(file_path, project_path)
+        
+        if is_binary_file(file_path):
+            continue
             
-            if is_binary_file(file_path):
-                continue
-                
-            metrics.total_files += 1
-            functions, line_count = analyze_file_content(file_path)
+        metrics.total_files += 1
+        functions, line_count = analyze_file_content(file_path)
+        
+        if functions or line_count > 0:
+            if not first_file:
+                content.append("")
+            else:
+                first_file = False
             
-            if functions or line_count > 0:
-                if not first_file:
-                    content.append("")
-                else:
-                    first_file = False
-                
-                file_type, file_desc = get_file_type_info(file)
-                content.append(f"`{rel_path}` ({line_count} lines)")
-                content.append(f"**Main Responsibilities:** {file_desc}")
-                
-                # Update metrics
-                ext = os.path.splitext(file)[1].lower()
-                metrics.files_by_type[ext] = metrics.files_by_type.get(ext, 0) + 1
-                metrics.lines_by_type[ext] = metrics.lines_by_type.get(ext, 0) + line_count
-                metrics.total_lines += line_count
-                
-                if functions:
-                    content.append("**Key Functions:**")
-                    for func_name, description in functions:
-                        content.append(f"<{func_name}>: {description}")
-                        if "Duplicate Alert" in description:
-                            metrics.duplicate_functions += 1
-                
-                # Get file-specific length limit and check thresholds
-                length_limit = get_file_length_limit(file_path)
-                alert_level, alert_message = get_file_length_alert(line_count, length_limit, thresholds)
-                if alert_level:
-                    metrics.alerts[alert_level] += 1
-                    content.append(f"**{alert_message} ({line_count} lines vs. recommended {length_limit})**")
-    
+            file_type, file_desc = get_file_type_info(file)
+            content.append(f"`{rel_path}` ({line_count} lines)")
+            content.append(f"**Main Responsibilities:** {file_desc}")
+            
+            # Update metrics
+            ext = os.path.splitext(file)[1].lower()
+            metrics.files_by_type[ext] = metrics.files_by_type.get(ext, 0) + 1
+            metrics.lines_by_type[ext] = metrics.lines_by_type.get(ext, 0) + line_count
+            metrics.total_lines += line_count
+            
+            if functions:
+                content.append("**Key Functions:**")
+                for func_name, description in functions:
+                    content.append(f"<{func_name}>: {description}")
+                    if "Duplicate Alert" in description:
+                        metrics.duplicate_functions += 1
+            
+            # Get file-specific length limit and check thresholds
+            length_limit = get_file_length_limit(file_path)
+            alert_level, alert_message = get_file_length_alert(line_count, length_limit, thresholds)
+            if alert_level:
+                metrics.alerts[alert_level] += 1
+                content.append(f"**{alert_message} ({line_count} lines vs. recommended {length_limit})**")
+
     # Add metrics summary
     content.extend([
         "",
@@ -149,21 +162,55 @@ def generate_focus_content(project_path, config):
     
     return '\n'.join(content)
 
-def get_directory_structure(project_path, max_depth=3, current_depth=0):
-    """Get the directory structure."""
+def walk_project_files(project_path, max_depth=3, ignored_directories=frozenset()):
+    """Yield file entries top-down like os.walk, without descending past max_depth.
+    
+    Ignored directories are pruned before they are listed, and os.scandir
+    entries carry their file type so no extra stat call is needed.
+    """
+    pending = [(project_path, 0)]
+    while pending:
+        current_path, depth = pending.pop()
+        try:
+            with os.scandir(current_path) as it:
+                entries = list(it)
+        except OSError as e:
+            logging.debug(f"Error scanning directory {current_path}: {e}")
+            continue
+            
+        subdirectories = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if depth < max_depth and entry.name not in ignored_directories:
+                    subdirectories.append((entry.path, depth + 1))
+            elif entry.is_file():
+                yield entry
+                
+        # Reversed so the stack visits subdirectories in listing order
+        pending.extend(reversed(subdirectories))
+
+def get_directory_structure(project_path, max_depth=3, current_depth=0, ignored_directories=None):
+    """Get the directory structure.
+    
+    ignored_directories is the project's merged ignore set; without it the
+    global ignore list from config.json applies.
+    """
     if current_depth > max_depth:
         return {}
     
     structure = {}
     try:
         for item in os.listdir(project_path):
-            if should_ignore_file(item):
+            if ignored_directories is None:
+                if should_ignore_file(item):
+                    continue
+            elif item.startswith('.') or item in ignored_directories:
                 continue
                 
             item_path = os.path.join(project_path, item)
             
             if os.path.isdir(item_path):
-                substructure = get_directory_structure(item_path, max_depth, current_depth + 1)
+                substructure = get_directory_structure(item_path, max_depth, current_depth + 1, ignored_directories)
                 if substructure:
                     structure[item] = substructure
             else:
@@ -209,16 +256,13 @@ def analyze_file_content(file_path):
             content = f.read()
             
         functions = []
-        for pattern_name, pattern in FUNCTION_PATTERNS.items():
+        for pattern_name, regex in _FUNCTION_REGEXES:
             try:
-                matches = re.finditer(pattern, content)
+                matches = regex.finditer(content)
                 for match in matches:
                     func_name = next(filter(None, match.groups()), None)
                     if func_name and func_name not in IGNORED_KEYWORDS:
                         functions.append((func_name, "Function detected"))
-            except re.error as e:
-                logging.debug(f"Invalid regex pattern {pattern_name} for {file_path}: {e}")
-                continue
             except Exception as e:
                 logging.debug(f"Error analyzing pattern {pattern_name} for {file_path}: {e}")
                 continue
@@ -1,213 +1,473 @@
 import os
+import sys
+import queue
+import atexit
+import argparse
+import copy
 import time
+import sched
+import types
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from datetime import datetime
-from config import load_config
-from content_generator import generate_focus_content
-from rules_analyzer import RulesAnalyzer
-from rules_generator import RulesGenerator
-from rules_watcher import ProjectWatcherManager
+from config import load_config, prepare_config, get_ignore_matchers, write_atomic
 import logging
-from auto_updater import AutoUpdater
+from logging.handlers import QueueHandler, QueueListener
 
-def get_default_config():
-    """Get default configuration with parent directory as project path."""
-    return {
-        'project_path': os.path.abspath(os.path.join(os.path.dirname(__file__), '..')),
-        'update_interval': 60,
-        'max_depth': 3,
-        'ignored_directories': [
-            '__pycache__',
-            'node_modules',
-            'venv',
-            '.git',
-            '.idea',
-            '.vscode',
-            'dist',
-            'build',
-            'CursorFocus'
-        ],
-        'ignored_files': [
-            '.DS_Store',
-            '*.pyc',
-            '*.pyo'
-        ],
-        'binary_extensions': [
-            '.png',
-            '.jpg',
-            '.jpeg',
-            '.gif',
-            '.ico',
-            '.pdf',
-            '.exe',
-            '.bin'
-        ],
-        'file_length_standards': {
-            '.js': 300,
-            '.jsx': 250,
-            '.ts': 300,
-            '.tsx': 250,
-            '.py': 400,
-            '.css': 400,
-            '.scss': 400,
-            '.less': 400,
-            '.sass': 400,
-            '.html': 300,
-            '.vue': 250,
-            '.svelte': 250,
-            '.json': 100,
-            '.yaml': 100,
-            '.yml': 100,
-            '.toml': 100,
-            '.md': 500,
-            '.rst': 500,
-            '.php': 400,
-            '.phtml': 300,
-            '.ctp': 300,
-            'default': 300
+logger = logging.getLogger(__name__)
+# Status output is informational; configure_logging() gives it somewhere to go
+logger.setLevel(logging.INFO)
+
+# Writes queued log records to stdout; started by configure_logging()
+_log_listener = None
+_logging_configured = False
+
+def configure_logging():
+    """Route log records through a queue to a single stdout writer thread.
+    
+    Safe to call repeatedly. When the application has already configured
+    the root logger, its handlers are left to receive the records.
+    """
+    global _log_listener, _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+    if logging.getLogger().handlers:
+        return
+    # Worker threads only enqueue records; one listener thread formats and writes them
+    log_queue = queue.Queue(-1)
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter('%(message)s'))
+    _log_listener = QueueListener(log_queue, console_handler)
+    # basicConfig would give the QueueHandler its default 'LEVEL:name:' format
+    logging.basicConfig(level=logging.WARNING, format='%(message)s', handlers=[QueueHandler(log_queue)])
+    _log_listener.start()
+    atexit.register(_stop_logging)
+
+def _stop_logging():
+    """Write out the remaining log records and stop the writer thread."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+def flush_logs():
+    """Write out queued log records, so they appear before a prompt."""
+    if _log_listener is not None:
+        # stop() drains the queue and joins the writer; start() resumes it
+        _log_listener.stop()
+        _log_listener.start()
+
+# Heavy modules (watchdog, Gemini SDK, requests) are imported where they are used
+
+__all__ = [
+    'get_default_config',
+    'get_default_config_readonly',
+    'write_atomic',
+    'confirm_rules_regeneration',
+    'setup_cursor_focus',
+    'get_tree_fingerprint',
+    'regenerate_focus',
+    'FocusScheduler',
+    'ProjectMonitor',
+    'offer_update',
+    'main'
+]
+
+# Built once at import; matchers are attached by prepare_config() on the final merged config
+_DEFAULT_CONFIG = types.MappingProxyType({
+    'project_path': os.path.abspath(os.path.join(os.path.dirname(__file__), '..')),
+    'update_interval': 60,
+    'poll_fallback_interval': 5,
+    'max_depth': 3,
+    'ignored_directories': [
+        '__pycache__',
+        'node_modules',
+        'venv',
+        '.git',
+        '.idea',
+        '.vscode',
+        'dist',
+        'build',
+        'CursorFocus'
+    ],
+    'ignored_files': [
+        '.DS_Store',
+        '*.pyc',
+        '*.pyo'
+    ],
+    'binary_extensions': [
+        '.png',
+        '.jpg',
+        '.jpeg',
+        '.gif',
+        '.ico',
+        '.pdf',
+        '.exe',
+        '.bin'
+    ],
+    'file_length_standards': {
+        '.js': 300,
+        '.jsx': 250,
+        '.ts': 300,
+        '.tsx': 250,
+        '.py': 400,
+        '.css': 400,
+        '.scss': 400,
+        '.less': 400,
+        '.sass': 400,
+        '.html': 300,
+        '.vue': 250,
+        '.svelte': 250,
+        '.json': 100,
+        '.yaml': 100,
+        '.yml': 100,
+        '.toml': 100,
+        '.md': 500,
+        '.rst': 500,
+        '.php': 400,
+        '.phtml': 300,
+        '.ctp': 300,
+        'default': 300
+    },
+    'file_length_thresholds': {
+        'warning': 1.0,
+        'critical': 1.5,
+        'severe': 2.0
+    },
+    'project_types': {
+        'chrome_extension': {
+            'indicators': ['manifest.json'],
+            'required_files': [],
+            'description': 'Chrome Extension'
+        },
+        'node_js': {
+            'indicators': ['package.json'],
+            'required_files': [],
+            'description': 'Node.js Project'
+        },
+        'python': {
+            'indicators': ['setup.py', 'pyproject.toml'],
+            'required_files': [],
+            'description': 'Python Project'
+        },
+        'react': {
+            'indicators': [],
+            'required_files': ['src/App.js', 'src/index.js'],
+            'description': 'React Application'
         },
-        'file_length_thresholds': {
-            'warning': 1.0,
-            'critical': 1.5,
-            'severe': 2.0
+        'php': {
+            'indicators': ['composer.json', 'index.php'],
+            'required_files': [],
+            'description': 'PHP Project'
         },
-        'project_types': {
-            'chrome_extension': {
-                'indicators': ['manifest.json'],
-                'required_files': [],
-                'description': 'Chrome Extension'
-            },
-            'node_js': {
-                'indicators': ['package.json'],
-                'required_files': [],
-                'description': 'Node.js Project'
-            },
-            'python': {
-                'indicators': ['setup.py', 'pyproject.toml'],
-                'required_files': [],
-                'description': 'Python Project'
-            },
-            'react': {
-                'indicators': [],
-                'required_files': ['src/App.js', 'src/index.js'],
-                'description': 'React Application'
-            },
-            'php': {
-                'indicators': ['composer.json', 'index.php'],
-                'required_files': [],
-                'description': 'PHP Project'
-            },
-            'laravel': {
-                'indicators': ['artisan'],
-                'required_files': [],
-                'description': 'Laravel Project'
-            },
-            'wordpress': {
-                'indicators': ['wp-config.php'],
-                'required_files': [],
-                'description': 'WordPress Project'
-            }
+        'laravel': {
+            'indicators': ['artisan'],
+            'required_files': [],
+            'description': 'Laravel Project'
+        },
+        'wordpress': {
+            'indicators': ['wp-config.php'],
+            'required_files': [],
+            'description': 'WordPress Project'
         }
     }
+})
+
+def get_default_config():
+    """Get a mutable copy of the default configuration."""
+    return copy.deepcopy(dict(_DEFAULT_CONFIG))
+
+def get_default_config_readonly():
+    """Get the shared read-only default configuration without copying it."""
+    return _DEFAULT_CONFIG
+
+def confirm_rules_regeneration(projects, assume_yes=False):
+    """Ask once which projects with an existing .cursorrules should get a new one.
+    
+    Returns:
+        set: Project paths whose .cursorrules should be regenerated
+    """
+    existing = [
+        p for p in projects
+        if os.path.exists(os.path.join(p['project_path'], '.cursorrules'))
+    ]
+    if not existing or assume_yes:
+        return {p['project_path'] for p in existing}
+
+    print("\n.cursorrules exists for:")
+    for i, project in enumerate(existing, 1):
+        print(f"{i}. {project['name']}")
+    response = input("Generate new? (numbers/all/n): ").strip().lower()
+
+    if response in ['y', 'yes', 'all']:
+        return {p['project_path'] for p in existing}
+    try:
+        indices = [int(i) - 1 for i in response.split()]
+    except ValueError:
+        return set()
+    return {existing[i]['project_path'] for i in indices if 0 <= i < len(existing)}
+
+def setup_cursor_focus(project_path, project_name=None, assume_yes=False, regenerate_rules=None):
+    """Set up CursorFocus for a project by generating necessary files.
+    
+    Args:
+        project_path: Path to the project directory
+        project_name: Optional display name of the project
+        assume_yes: Regenerate an existing .cursorrules without asking
+        regenerate_rules: Pre-made decision for an existing .cursorrules;
+                          None asks interactively (unless assume_yes)
+    """
+    from content_generator import generate_focus_content
+    from rules_generator import RulesGenerator
+
+    configure_logging()
 
-def setup_cursor_focus(project_path, project_name=None):
-    """Set up CursorFocus for a project by generating necessary files."""
     try:
         rules_file = os.path.join(project_path, '.cursorrules')
         
-        # Check if .cursorrules exists and ask user
+        # Check if .cursorrules exists and ask user unless already decided
         if os.path.exists(rules_file):
-            print(f"\n.cursorrules exists for {project_name or 'project'}")
-            response = input("Generate new? (y/n): ").lower()
-            if response != 'y':
+            if regenerate_rules is None and not assume_yes:
+                flush_logs()
+                print(f"\n.cursorrules exists for {project_name or 'project'}")
+                regenerate_rules = input("Generate new? (y/n): ").lower() == 'y'
+            if regenerate_rules is False:
                 return
         
         # Generate .cursorrules file
-        print(f"\n📄 Analyzing: {project_path}")
-        analyzer = RulesAnalyzer(project_path)
-        project_info = analyzer.analyze_project_for_rules()
-        
+        logger.info(f"\n📄 Analyzing: {project_path}")
         rules_generator = RulesGenerator(project_path)
-        rules_file = rules_generator.generate_rules_file(project_info)
-        print(f"✓ {os.path.basename(rules_file)}")
+        rules_file = rules_generator.generate_rules_file()
+        logger.info(f"✓ {os.path.basename(rules_file)}")
 
         # Generate initial Focus.md with default config
         focus_file = os.path.join(project_path, 'Focus.md')
-        default_config = get_default_config()
+        default_config = get_default_config_readonly()
         content = generate_focus_content(project_path, default_config)
-        with open(focus_file, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"✓ {os.path.basename(focus_file)}")
+        write_atomic(focus_file, content)
+        logger.info(f"✓ {os.path.basename(focus_file)}")
 
     except Exception as e:
-        print(f"❌ Setup error: {e}")
+        logger.error(f"❌ Setup error: {e}")
         raise
 
-def monitor_project(project_config, global_config):
-    """Monitor a single project."""
+# Digest of the last written Focus.md content and tree fingerprint per file
+_last_hashes = {}
+_last_fingerprints = {}
+_focus_lock = threading.Lock()
+
+def get_tree_fingerprint(project_path, config):
+    """Hash path, mtime and size of every entry Focus.md is generated from."""
+    ignored_directories, _, _ = get_ignore_matchers(config)
+    max_depth = config.get('max_depth', 3)
+    digest = hashlib.blake2b(digest_size=16)
+    pending = [(project_path, 0)]
+    
+    while pending:
+        current_path, depth = pending.pop()
+        try:
+            with os.scandir(current_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+            
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in ignored_directories:
+                    digest.update(f"{entry.path}/\n".encode('utf-8', 'surrogateescape'))
+                    # Focus.md only covers files down to max_depth
+                    if depth < max_depth:
+                        pending.append((entry.path, depth + 1))
+                continue
+                
+            # Our own output (or its in-flight temp file) must not invalidate the cache
+            if current_path == project_path and (
+                entry.name == 'Focus.md' or entry.name.startswith('.Focus.md.')
+            ):
+                continue
+                
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            digest.update(f"{entry.path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode('utf-8', 'surrogateescape'))
+            
+    return digest.digest()
+
+def regenerate_focus(project_config, global_config):
+    """Regenerate Focus.md for a project if its content changed."""
+    from content_generator import generate_focus_content
+
+    configure_logging()
+
     project_path = project_config['project_path']
     project_name = project_config['name']
-    print(f"👀 {project_name}")
     
     # Merge project config with global config
-    config = {**global_config, **project_config}
-    
+    # Re-prepared so the project's own ignore lists replace the global matchers
+    config = prepare_config({**global_config, **project_config})
     focus_file = os.path.join(project_path, 'Focus.md')
-    last_content = None
-    last_update = 0
 
-    # Start rules watcher for this project
-    watcher = ProjectWatcherManager()
-    watcher.add_project(project_path, project_name)
+    fingerprint = get_tree_fingerprint(project_path, config)
+    with _focus_lock:
+        if _last_fingerprints.get(focus_file) == fingerprint:
+            return
 
-    while True:
-        current_time = time.time()
-        
-        if current_time - last_update < config.get('update_interval', 60):
-            time.sleep(1)
-            continue
-            
-        content = generate_focus_content(project_path, config)
-        
-        if content != last_content:
-            try:
-                with open(focus_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                last_content = content
-                print(f"✓ {project_name} ({datetime.now().strftime('%H:%M')})")
-            except Exception as e:
-                print(f"❌ {project_name}: {e}")
-        
-        last_update = current_time
+    content = generate_focus_content(project_path, config)
+    content_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
 
-def main():
+    with _focus_lock:
+        if _last_hashes.get(focus_file) == content_hash:
+            _last_fingerprints[focus_file] = fingerprint
+            return
+
+    try:
+        write_atomic(focus_file, content)
+        with _focus_lock:
+            _last_hashes[focus_file] = content_hash
+            _last_fingerprints[focus_file] = fingerprint
+        logger.info(f"✓ {project_name} ({datetime.now().strftime('%H:%M')})")
+    except Exception as e:
+        logger.error(f"❌ {project_name}: {e}")
+
+class FocusScheduler:
+    """One scheduler for all projects that sleeps until the next due regeneration."""
+
+    def __init__(self):
+        self._wakeup = threading.Event()
+        self._scheduler = sched.scheduler(time.monotonic, self._delay)
+
+    def _delay(self, timeout):
+        # Unlike time.sleep, an earlier entry added meanwhile wakes us up
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+    def enter(self, delay, action, argument=()):
+        """Schedule an action to run after delay seconds."""
+        event = self._scheduler.enter(delay, 1, action, argument)
+        self._wakeup.set()
+        return event
+
+    def cancel(self, event):
+        """Cancel a scheduled action if it has not run yet."""
+        try:
+            self._scheduler.cancel(event)
+        except ValueError:
+            pass
+
+    def run_forever(self):
+        """Run scheduled actions, blocking while nothing is due."""
+        while True:
+            self._scheduler.run()
+            self._wakeup.wait()
+            self._wakeup.clear()
+
+class ProjectMonitor:
+    """Turn file changes of one project into debounced regeneration tasks."""
+
+    def __init__(self, project_config, global_config, executor, scheduler):
+        from rules_watcher import get_watcher_manager
+
+        self.project_config = project_config
+        self.global_config = global_config
+        self.executor = executor
+        self.scheduler = scheduler
+        self.config = prepare_config({**global_config, **project_config})
+        self.watcher = get_watcher_manager()
+        self._lock = threading.Lock()
+        self._pending = None
+        self.update_interval = int(self.config.get('update_interval', 60))
+        self._last_update = time.monotonic() - self.update_interval
+
+    def start(self):
+        """Start watching the project and queue the initial regeneration."""
+        logger.info(f"👀 {self.project_config['name']}")
+        self.watcher.add_project(
+            self.project_config['project_path'],
+            self.project_config['name'],
+            on_change=self.on_change,
+            config=self.config
+        )
+        self.on_change()
+
+    def stop(self):
+        """Stop watching and drop any pending regeneration."""
+        with self._lock:
+            if self._pending:
+                self.scheduler.cancel(self._pending)
+                self._pending = None
+        self.watcher.remove_project(self.project_config['name'])
+
+    def on_change(self):
+        """Schedule a regeneration, at most one per update interval."""
+        with self._lock:
+            if self._pending:
+                return
+            delay = self.update_interval - (time.monotonic() - self._last_update)
+            self._pending = self.scheduler.enter(max(delay, 0), self._submit)
+
+    def _submit(self):
+        with self._lock:
+            self._pending = None
+            self._last_update = time.monotonic()
+        self.executor.submit(regenerate_focus, self.project_config, self.global_config)
+
+def offer_update(updater, update_future, assume_yes=False):
+    """Collect the background update check and offer to install an update.
+    
+    Returns:
+        bool: True if an update was installed and the program should exit
+    """
+    try:
+        update_info = update_future.result(timeout=5)
+    except FuturesTimeoutError:
+        # Monitoring must not depend on the update server being reachable
+        logger.warning("Update check timed out, skipping")
+        return False
+
+    flush_logs()
+
+    if not update_info:
+        print("✓ Latest version")
+        return False
+
+    print(f"📦 Update available: {update_info['message']}")
+    if assume_yes or input("Update now? (y/n): ").lower() == 'y':
+        print("⏳ Downloading...")
+        if updater.update(update_info):
+            print("✅ Updated! Please restart")
+            return True
+        print("❌ Update failed")
+    return False
+
+def main(argv=None):
     """Main function to monitor multiple projects."""
-    logging.basicConfig(
-        level=logging.WARNING,
-        format='%(levelname)s: %(message)s'
-    )
+    parser = argparse.ArgumentParser(description='Monitor projects and keep Focus.md up to date')
+    parser.add_argument('--assume-yes', '-y', action='store_true', help='Answer yes to all prompts')
+    parser.add_argument('--no-regen-rules', action='store_true', help='Keep existing .cursorrules files')
+    parser.add_argument('--projects', '-p', help='Comma-separated names of configured projects to run')
+    args = parser.parse_args(argv)
+
+    configure_logging()
 
-    # Check updates
+    from auto_updater import AutoUpdater
+
+    # Check updates in the background while config loading and setup run
     print("\n🔄 Checking updates...")
     updater = AutoUpdater()
-    update_info = updater.check_for_updates()
-    
-    if update_info:
-        print(f"📦 Update available: {update_info['message']}")
-        if input("Update now? (y/n): ").lower() == 'y':
-            print("⏳ Downloading...")
-            if updater.update(update_info):
-                print("✅ Updated! Please restart")
-                return
-            else:
-                print("❌ Update failed")
-    else:
-        print("✓ Latest version")
+    update_executor = ThreadPoolExecutor(max_workers=1)
+    update_future = update_executor.submit(updater.check_for_updates)
+    update_executor.shutdown(wait=False)
 
     config = load_config()
     if not config:
         print("No config.json found")
         config = get_default_config()
 
+    prepare_config(config)
+
     if 'projects' not in config:
         config['projects'] = [{
             'name': 'Default Project',
@@ -216,42 +476,70 @@ def main():
             'max_depth': config.get('max_depth', 3)
         }]
 
-    from threading import Thread
-    threads = []
+    if args.projects:
+        selected = {name.strip().lower() for name in args.projects.split(',')}
+        config['projects'] = [p for p in config['projects'] if p['name'].lower() in selected]
+
+    projects = [p for p in config['projects'] if os.path.exists(p['project_path'])]
+    monitors = []
+    executor = None
     
     try:
-        # Setup projects
-        for project in config['projects']:
-            if os.path.exists(project['project_path']):
-                setup_cursor_focus(project['project_path'], project['name'])
-            else:
-                print(f"⚠️ Not found: {project['project_path']}")
-                continue
+        # Ask about every existing .cursorrules in one prompt before any work starts
+        if args.no_regen_rules:
+            regenerate = set()
+        else:
+            regenerate = confirm_rules_regeneration(projects, args.assume_yes)
 
-        # Start monitoring
         for project in config['projects']:
-            if os.path.exists(project['project_path']):
-                thread = Thread(
-                    target=monitor_project,
-                    args=(project, config),
-                    daemon=True
-                )
-                thread.start()
-                threads.append(thread)
-
-        if not threads:
-            print("❌ No projects to monitor")
+            if not os.path.exists(project['project_path']):
+                logger.warning(f"⚠️ Not found: {project['project_path']}")
+
+        if not projects:
+            if offer_update(updater, update_future, args.assume_yes):
+                return
+            logger.error("❌ No projects to monitor")
             return
 
-        print(f"\n📝 Monitoring {len(threads)} projects (Ctrl+C to stop)")
+        # One bounded pool runs the (I/O-bound) setup and later the regenerations
+        executor = ThreadPoolExecutor(max_workers=min(32, len(projects)))
+
+        # Setup projects in parallel; prompts were already answered above
+        list(executor.map(
+            lambda project: setup_cursor_focus(
+                project['project_path'],
+                project['name'],
+                regenerate_rules=project['project_path'] in regenerate
+            ),
+            projects
+        ))
+
+        if offer_update(updater, update_future, args.assume_yes):
+            return
+
+        # Start monitoring: watchers queue regenerations on the same pool
+        scheduler = FocusScheduler()
+        for project in projects:
+            monitor = ProjectMonitor(project, config, executor, scheduler)
+            monitor.start()
+            monitors.append(monitor)
+
+        logger.info(f"\n📝 Monitoring {len(monitors)} projects (Ctrl+C to stop)")
         
-        while True:
-            time.sleep(1)
+        scheduler.run_forever()
             
     except KeyboardInterrupt:
-        print("\n👋 Stopping")
+        logger.info("\n👋 Stopping")
     except Exception as e:
-        print(f"\n❌ Error: {e}")
+        logger.error(f"\n❌ Error: {e}")
+    finally:
+        for monitor in monitors:
+            monitor.stop()
+        if monitors:
+            from rules_watcher import get_watcher_manager
+            get_watcher_manager().stop_all()
+        if executor:
+            executor.shutdown(wait=False)
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
@@ -199,19 +199,22 @@ def detect_language_and_framework(project_path):
             max_matches = matches
             detected_language = lang
             
+    # Read and lowercase each manifest once, not once per framework
+    manifests = []
+    for f in files:
+        if f in ['requirements.txt', 'package.json', 'composer.json']:
+            try:
+                with open(os.path.join(project_path, f), 'r') as file:
+                    manifests.append(file.read().lower())
+            except:
+                continue
+
     # Detect framework by checking file contents
     detected_framework = 'none'
     for framework, indicators in framework_indicators.items():
-        for f in files:
-            if f in ['requirements.txt', 'package.json', 'composer.json']:
-                try:
-                    with open(os.path.join(project_path, f), 'r') as file:
-                        content = file.read().lower()
-                        if any(ind.lower() in content for ind in indicators):
-                            detected_framework = framework
-                            break
-                except:
-                    continue
+        lowered = [ind.lower() for ind in indicators]
+        if any(ind in content for content in manifests for ind in lowered):
+            detected_framework = framework
                     
     return detected_language, detected_framework
 
@@ -335,10 +338,13 @@ def get_file_type_info(filename):
 
 def _do_scan(root_path, max_depth=3, ignored_dirs=None):
     """Perform a scan of the directory to find projects."""
+    return list(iter_projects(root_path, max_depth, ignored_dirs))
+
+def iter_projects(root_path, max_depth=3, ignored_dirs=None):
+    """Yield projects under root_path as they are found, without caching."""
     if ignored_dirs is None:
         ignored_dirs = _config.get('ignored_directories', [])
     
-    projects = []
     root_path = os.path.abspath(root_path or '.')
     
     # Check the root directory first
@@ -347,14 +353,14 @@ def _do_scan(root_path, max_depth=3, ignored_dirs=None):
         # Analyze project information
         project_info = get_project_description(root_path)
         language, framework = detect_language_and_framework(root_path)
-        projects.append({
+        yield {
             'path': root_path,
             'type': project_type,
             'name': project_info.get('name', os.path.basename(root_path)),
             'description': project_info.get('description', 'No description available'),
             'language': language,
             'framework': framework
-        })
+        }
     
     def _scan_directory(current_path, current_depth):
         if current_depth > max_depth:
@@ -375,22 +381,21 @@ def _do_scan(root_path, max_depth=3, ignored_dirs=None):
                         # Analyze project information
                         project_info = get_project_description(item_path)
                         language, framework = detect_language_and_framework(item_path)
-                        projects.append({
+                        yield {
                             'path': item_path,
                             'type': project_type,
                             'name': project_info.get('name', item),
                             'description': project_info.get('description', 'No description available'),
                             'language': language,
                             'framework': framework
-                        })
+                        }
                     else:
                         # If not a project, scan further
-                        _scan_directory(item_path, current_depth + 1)
+                        yield from _scan_directory(item_path, current_depth + 1)
                     
         except (PermissionError, OSError):
             # Skip directories we can't access
             pass
             
     # Start scanning from the root directory
-    _scan_directory(root_path, 0)
-    return projects 
\ No newline at end of file
+    yield from _scan_directory(root_path, 0)
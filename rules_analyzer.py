@@ -1,17 +1,23 @@
 import os
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Mapping
 
 class RulesAnalyzer:
+    EXCLUDED_DIRECTORIES = frozenset({'node_modules', 'venv', '.git', '__pycache__', 'build', 'dist'})
+
     def __init__(self, project_path: str):
         self.project_path = project_path
 
-    def analyze_project_for_rules(self) -> Dict[str, Any]:
-        """Analyze the project and return project information for rules generation."""
+    def analyze_project_for_rules(self, extension_counts: Mapping[str, int] = None) -> Dict[str, Any]:
+        """Analyze the project and return project information for rules generation.
+        
+        A caller that has already walked the project can pass its per-extension
+        file counts so the tree is not walked a second time.
+        """
         project_info = {
             'name': self._detect_project_name(),
             'version': '1.0.0',
-            'language': self._detect_main_language(),
+            'language': self._detect_main_language(extension_counts),
             'framework': self._detect_framework(),
             'type': self._detect_project_type()
         }
@@ -47,18 +53,26 @@ class RulesAnalyzer:
         # Default to directory name
         return os.path.basename(os.path.abspath(self.project_path))
 
-    def _detect_main_language(self) -> str:
+    def _detect_main_language(self, extension_counts: Mapping[str, int] = None) -> str:
         """Detect the main programming language used in the project."""
-        extensions = {}
+        extensions = dict(extension_counts) if extension_counts is not None else {}
         
-        for root, _, files in os.walk(self.project_path):
-            if 'node_modules' in root or 'venv' in root or '.git' in root:
+        # Excluded directories are skipped before they are listed, and scandir
+        # entries already know whether they are directories
+        pending = [self.project_path] if extension_counts is None else []
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir():
+                            if entry.name not in self.EXCLUDED_DIRECTORIES and not entry.is_symlink():
+                                pending.append(entry.path)
+                            continue
+                        ext = os.path.splitext(entry.name)[1].lower()
+                        if ext:
+                            extensions[ext] = extensions.get(ext, 0) + 1
+            except OSError:
                 continue
-                
-            for file in files:
-                ext = os.path.splitext(file)[1].lower()
-                if ext:
-                    extensions[ext] = extensions.get(ext, 0) + 1
 
         # Map extensions to languages
         language_map = {
@@ -1,12 +1,45 @@
 import os
+import sys
 import json
+import codecs
+import hashlib
+import itertools
 from typing import Dict, Any, List
 from datetime import datetime
-import google.generativeai as genai
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import re
 from rules_analyzer import RulesAnalyzer
 from dotenv import load_dotenv
 
+try:
+    # Optional: the third-party regex module can abort runaway backtracking
+    import regex as _regex
+except ImportError:
+    _regex = None
+
+try:
+    # Optional: faster JSON parsing and serialization
+    import orjson
+except ImportError:
+    orjson = None
+
+# Extra arguments for scans with backtracking-prone patterns
+SCAN_KWARGS = {'timeout': 0.5} if _regex else {}
+
+# Line separator for the prompt builders
+NL = "\n"
+
+def _lines(items, limit: int = None) -> str:
+    """Join prompt lines, taking at most limit of them."""
+    return NL.join(itertools.islice(items, limit))
+
+def _compile_guarded(pattern: str, flags: int = 0):
+    """Compile with the regex module when installed so scans can time out."""
+    if _regex:
+        return _regex.compile(pattern, int(flags))
+    return re.compile(pattern, flags)
+
 class RulesGenerator:
     # Common regex patterns
     IMPORT_PATTERNS = {
@@ -43,25 +76,110 @@ class RulesGenerator:
     }
 
     METHOD_PATTERN = r'(?:async\s+)?(\w+)\s*\((.*?)\)\s*{'
-    VARIABLE_PATTERN = r'(?:const|let|var)\s+(\w+)\s*=\s*([^;]+)'
+    VARIABLE_PATTERN = r'(?:const|let|var)\s+(\w+)\s*=\s*([^;\n]+)'
     ERROR_PATTERN = r'try\s*{[^}]*}\s*catch\s*\((\w+)\)'
     INTERFACE_PATTERN = r'(?:interface|type)\s+(\w+)(?:\s+extends\s+([^{]+))?'
     JSX_COMPONENT_PATTERN = r'<(\w+)(?:\s+[^>]*)?>'
 
+    # Compiled once at class creation so the analyzers skip the re module cache
+    IMPORT_RE = {lang: re.compile(p, re.MULTILINE) for lang, p in IMPORT_PATTERNS.items()}
+    CLASS_RE = {lang: re.compile(p, re.MULTILINE) for lang, p in CLASS_PATTERNS.items()}
+    FUNCTION_RE = {
+        lang: (_compile_guarded if lang in ('javascript', 'typescript', 'php') else re.compile)(p, re.MULTILINE)
+        for lang, p in FUNCTION_PATTERNS.items()
+    }
+    METHOD_RE = _compile_guarded(METHOD_PATTERN)
+    VARIABLE_RE = re.compile(VARIABLE_PATTERN)
+    ERROR_RE = re.compile(ERROR_PATTERN)
+    INTERFACE_RE = re.compile(INTERFACE_PATTERN)
+    JSX_COMPONENT_RE = re.compile(JSX_COMPONENT_PATTERN)
+    JSON_BLOCK_RE = re.compile(r'({[\s\S]*})')
+
+    # Single-pass scanners for pattern sets whose alternatives start with
+    # distinct keywords, so fusing them does not hide matches from each other
+    PYTHON_SCANNER = re.compile('|'.join([
+        f"(?P<cls>{CLASS_PATTERNS['python']})",
+        f"(?P<func>{FUNCTION_PATTERNS['python']})"
+    ]), re.MULTILINE)
+    MODULE_NAME_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.')
+
+    CPP_ORGANIZATION_SCANNER = re.compile(
+        r'(?P<template>template\s*<([^>]+)>)|(?P<namespace>namespace\s+(\w+)\s*{)'
+    )
+    C_ORGANIZATION_SCANNER = re.compile(
+        r'(?P<macro>#define\s+(\w+)(?:\(([^)]*)\))?\s+(.+))'
+        r'|(?P<typedef>typedef\s+(?:struct|enum|union)?\s*(\w+)\s+(\w+);)'
+    )
+
+    # Oversized files are truncated: only this much is read for pattern
+    # scanning, and only the sample prefix of the first few files is kept
+    # for the AI prompt
+    MAX_READ_BYTES = 1_048_576
+    CODE_SAMPLE_CHARS = 10000
+    CODE_SAMPLE_FILES = 50
+    # Larger code files (typically minified bundles) are listed but not scanned,
+    # since the nested optional groups in the patterns backtrack badly on them
+    MAX_SCAN_BYTES = int(os.environ.get('CURSORFOCUS_MAX_SCAN_BYTES', 524288))
+    # Generated files say nothing about the project's own style; skip them entirely
+    GENERATED_FILE_SUFFIXES = ('.min.js', '.bundle.js', '-lock.json')
+
+    BUILD_FILES = frozenset({'setup.py', 'requirements.txt', 'package.json', 'Makefile'})
+    SUPPORT_TOKENS = ('util', 'helper', 'common', 'shared')
+    # Suffixes of the prompt's config group; '.env' and '.gitignore' are
+    # also whole dotfile names, which splitext reports with no extension
+    PROMPT_CONFIG_SUFFIXES = frozenset({'.json', '.md', '.env', '.gitignore'})
+
+    CONFIG_EXTENSIONS = frozenset({'.json', '.yaml', '.ini', '.conf'})
+    EXCLUDED_DIRECTORIES = frozenset({
+        'node_modules', 'venv', '.venv', '.git', '__pycache__',
+        'build', 'dist', '.mypy_cache', '.pytest_cache'
+    })
+
     def __init__(self, project_path: str):
         self.project_path = project_path
         self.analyzer = RulesAnalyzer(project_path)
+
+        # Code file extension -> analyzer, so the walk does one dict lookup per file
+        self.code_analyzers = {
+            '.py': self._analyze_python_file,
+            '.js': self._analyze_js_file,
+            '.ts': self._analyze_ts_file,
+            '.tsx': self._analyze_ts_file,
+            '.kt': self._analyze_kotlin_file,
+            '.php': self._analyze_php_file,
+            '.swift': self._analyze_swift_file,
+            '.cpp': self._analyze_cpp_file,
+            '.hpp': self._analyze_cpp_file,
+            '.c': self._analyze_c_file,
+            '.h': self._analyze_c_file
+        }
         
         # Load environment variables from .env
         load_dotenv()
         
-        # Initialize Gemini AI
+        # The Gemini SDK is only loaded once a prompt is actually sent
+        self.api_key = os.environ.get("GEMINI_API_KEY")
+        if not self.api_key:
+            print("\n⚠️ Error when initializing Gemini AI: GEMINI_API_KEY is required")
+            raise ValueError("GEMINI_API_KEY is required")
+        self.model = None
+        self.chat_session = None
+
+        # Last project structure and the file fingerprint it was built from
+        self._structure_key = None
+        self._structure_cache = None
+        # rel_path -> ((mtime_ns, size), partial without code samples)
+        self._file_cache = {}
+
+    def _ensure_model(self):
+        """Import and configure Gemini AI on first use."""
+        if self.chat_session is not None:
+            return
+
         try:
-            api_key = os.environ.get("GEMINI_API_KEY")
-            if not api_key:
-                raise ValueError("GEMINI_API_KEY is required")
+            import google.generativeai as genai
 
-            genai.configure(api_key=api_key)
+            genai.configure(api_key=self.api_key)
             self.model = genai.GenerativeModel(
                 model_name="gemini-2.0-flash-exp",
                 generation_config={
@@ -81,19 +199,53 @@ class RulesGenerator:
         """Get current timestamp in standard format."""
         return datetime.now().strftime('%B %d, %Y at %I:%M %p')
 
-    def _analyze_project_structure(self) -> Dict[str, Any]:
-        """Analyze project structure and collect detailed information."""
-        structure = {
+    def _read_file(self, file_path: str, limit: int = None) -> str:
+        """Read a UTF-8 file with raw os calls, without a buffered text stack.
+        
+        Files longer than limit bytes are truncated to their first limit bytes.
+        """
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            if limit is not None:
+                size = min(size, limit)
+            chunks = []
+            remaining = limit
+            while remaining is None or remaining > 0:
+                chunk = os.read(fd, max(size, 65536) if remaining is None else remaining)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                if remaining is not None:
+                    remaining -= len(chunk)
+        finally:
+            os.close(fd)
+
+        # A non-final decode drops a multi-byte character cut off by the limit
+        content = codecs.getincrementaldecoder('utf-8')().decode(
+            b''.join(chunks), final=remaining is None or remaining > 0
+        )
+        # Match the newline translation of text-mode open()
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+
+    def _new_structure(self) -> Dict[str, Any]:
+        """Create an empty project structure record."""
+        return {
             'files': [],
-            'dependencies': {},
-            'frameworks': [],
+            'dependencies': set(),
+            'frameworks': set(),
             'languages': {},
             'config_files': [],
+            'files_by_ext': {},
+            'extension_counts': Counter(),  # Every walked file, for language detection
+            'core_py_modules': [],  # Python files other than setup/config/test
             'code_contents': {},
             'patterns': {
                 'classes': [],
                 'functions': [],
-                'imports': [],
+                'imports': Counter(),  # Import name -> number of mentions
                 'error_handling': [],
                 'configurations': [],
                 'naming_patterns': {},  # Track naming conventions
@@ -102,77 +254,205 @@ class RulesGenerator:
                 'function_patterns': [], # Track function patterns
                 'class_patterns': [],    # Track class patterns
                 'error_patterns': [],    # Track error handling patterns
-                'performance_patterns': [] # Track performance patterns
+                'performance_patterns': [], # Track performance patterns
+                # Per-file view of function/class/import records
+                'by_file': defaultdict(lambda: {'functions': [], 'classes': [], 'imports': []})
             }
         }
 
-        # Analyze each file
-        for root, _, files in os.walk(self.project_path):
-            if any(x in root for x in ['node_modules', 'venv', '.git', '__pycache__', 'build', 'dist']):
+    def _scan_file(self, file_path: str, rel_path: str, analyze, size: int) -> Dict[str, Any]:
+        """Read and analyze one file into its own partial structure."""
+        partial = self._new_structure()
+        if analyze:
+            if size > self.MAX_SCAN_BYTES:
+                return partial
+            try:
+                content = self._read_file(file_path, self.MAX_READ_BYTES)
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"⚠️ Error reading file {rel_path}: {e}")
+                return None
+            partial['code_contents'][rel_path] = content[:self.CODE_SAMPLE_CHARS]
+            try:
+                analyze(content, rel_path, partial)
+            except TimeoutError:
+                # The regex module gave up on a backtracking-prone pattern;
+                # keep the records found before it did
+                print(f"⚠️ Pattern scan timed out for {rel_path}")
+            except Exception as e:
+                # One odd file must not abort the whole project; keep its sample
+                print(f"⚠️ Error analyzing file {rel_path}: {e}")
+        else:
+            try:
+                content = self._read_file(file_path, self.MAX_READ_BYTES)
+                partial['patterns']['configurations'].append({
+                    'file': rel_path,
+                    'content': content
+                })
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"⚠️ Error reading config file {rel_path}: {e}")
+                return None
+        return partial
+
+    def _iter_project_files(self):
+        """Yield (entry, rel_path) for project files top-down like os.walk.
+        
+        Excluded directories are pruned before they are listed, and the
+        os.scandir entries cache their stat result for the caller.
+        """
+        pending = [(self.project_path, '')]
+        while pending:
+            current_path, rel_dir = pending.pop()
+            try:
+                with os.scandir(current_path) as it:
+                    entries = list(it)
+            except OSError:
                 continue
 
-            for file in files:
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, self.project_path)
-                
-                # Analyze code files
-                if file.endswith(('.py', '.js', '.ts', '.tsx', '.kt', '.php', '.swift', '.cpp', '.c', '.h', '.hpp')):
-                    structure['files'].append(rel_path)
-                    
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            structure['code_contents'][rel_path] = content
-                            
-                            # Common code analysis patterns
-                            file_ext = os.path.splitext(file)[1]
-                            
-                            # Language specific patterns
-                            if file_ext == '.py':
-                                self._analyze_python_file(content, rel_path, structure)
-                            elif file_ext == '.js':
-                                self._analyze_js_file(content, rel_path, structure)
-                            elif file_ext in ['.ts', '.tsx']:
-                                self._analyze_ts_file(content, rel_path, structure)
-                            elif file_ext == '.kt':
-                                self._analyze_kotlin_file(content, rel_path, structure)
-                            elif file_ext == '.php':
-                                self._analyze_php_file(content, rel_path, structure)
-                            elif file_ext == '.swift':
-                                self._analyze_swift_file(content, rel_path, structure)
-                            elif file_ext in ['.cpp', '.hpp']:
-                                self._analyze_cpp_file(content, rel_path, structure)
-                            elif file_ext in ['.c', '.h']:
-                                self._analyze_c_file(content, rel_path, structure)
-                                    
-                    except Exception as e:
-                        print(f"⚠️ Error reading file {rel_path}: {e}")
-                        continue
+            subdirectories = []
+            for entry in entries:
+                rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                # Interned: every pattern record of the file shares this one object
+                rel_path = sys.intern(rel_path)
+                if entry.is_dir():
+                    if entry.name not in self.EXCLUDED_DIRECTORIES and not entry.is_symlink():
+                        subdirectories.append((entry.path, rel_path))
+                else:
+                    yield entry, rel_path
+
+            # Reversed so the stack visits subdirectories in listing order
+            pending.extend(reversed(subdirectories))
+
+    def _scan_file_cached(self, file_path: str, rel_path: str, analyze, size: int, mtime_ns: int) -> Dict[str, Any]:
+        """Reuse the previous partial for a file whose mtime and size are unchanged."""
+        cached = self._file_cache.get(rel_path)
+        if cached and cached[0] == (mtime_ns, size):
+            return cached[1]
+        return self._scan_file(file_path, rel_path, analyze, size)
 
+    def _analyze_project_structure(self) -> Dict[str, Any]:
+        """Analyze project structure and collect detailed information."""
+        structure = self._new_structure()
+        work = []
+        # Fingerprint of every collected file; unchanged means reuse the last result
+        fingerprint = hashlib.blake2b(digest_size=16)
+
+        # Collect files to analyze
+        for entry, rel_path in self._iter_project_files():
+            file_path = entry.path
+            file_ext = os.path.splitext(entry.name)[1]
+            if file_ext:
+                structure['extension_counts'][file_ext.lower()] += 1
+            if entry.name.endswith(self.GENERATED_FILE_SUFFIXES):
+                continue
+            
+            # Analyze code files
+            analyze = self.code_analyzers.get(file_ext)
+            if analyze:
+                structure['files'].append(rel_path)
+                structure['files_by_ext'].setdefault(file_ext, []).append(rel_path)
+                if file_ext == '.py':
+                    rel_lower = rel_path.lower()
+                    if not any(x in rel_lower for x in ('setup', 'config', 'test')):
+                        structure['core_py_modules'].append(rel_path)
+            elif file_ext in self.CONFIG_EXTENSIONS:
                 # Classify files
-                if file.endswith(('.json', '.yaml', '.ini', '.conf')):
-                    structure['config_files'].append(rel_path)
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            structure['patterns']['configurations'].append({
-                                'file': rel_path,
-                                'content': content
-                            })
-                    except Exception as e:
-                        print(f"⚠️ Error reading config file {rel_path}: {e}")
-                        continue
+                structure['config_files'].append(rel_path)
+            else:
+                continue
+
+            try:
+                st = entry.stat()
+                mtime_ns, size = st.st_mtime_ns, st.st_size
+            except OSError:
+                mtime_ns, size = -1, -1
+            fingerprint.update(f"{rel_path}\0{mtime_ns}\0{size}\n".encode('utf-8', 'surrogateescape'))
+            work.append((file_path, rel_path, analyze, size, mtime_ns))
+
+        cache_key = fingerprint.digest()
+        if cache_key == self._structure_key:
+            return self._structure_cache
+
+        # Reads release the GIL, so a thread pool overlaps file I/O; map keeps
+        # walk order so the merged result matches a serial scan
+        file_cache = {}
+        with ThreadPoolExecutor() as executor:
+            partials = executor.map(lambda item: self._scan_file_cached(*item), work)
+            for (file_path, rel_path, analyze, size, mtime_ns), partial in zip(work, partials):
+                if partial is None:
+                    continue
+                # Only the first samples reach the prompt; drop the rest here
+                if len(structure['code_contents']) < self.CODE_SAMPLE_FILES:
+                    if partial['code_contents']:
+                        structure['code_contents'].update(partial['code_contents'])
+                    elif analyze and 0 <= size <= self.MAX_SCAN_BYTES:
+                        # Cached partials carry no sample; read just the prefix again
+                        try:
+                            content = self._read_file(file_path, self.CODE_SAMPLE_CHARS * 4)
+                            structure['code_contents'][rel_path] = content[:self.CODE_SAMPLE_CHARS]
+                        except (OSError, UnicodeDecodeError) as e:
+                            print(f"⚠️ Error reading file {rel_path}: {e}")
+                file_cache[rel_path] = ((mtime_ns, size), {**partial, 'code_contents': {}})
+                structure['dependencies'].update(partial['dependencies'])
+                for key, records in partial['patterns'].items():
+                    if records and key not in ('by_file', 'imports'):
+                        structure['patterns'][key].extend(records)
+                structure['patterns']['imports'].update(partial['patterns']['imports'])
 
+                # A partial only holds one file's records, so indexing is free here
+                structure['patterns']['by_file'][rel_path] = {
+                    'functions': partial['patterns']['function_patterns'],
+                    'classes': partial['patterns']['class_patterns'],
+                    'imports': list(partial['patterns']['imports'])
+                }
+
+        self._file_cache = file_cache
+        self._structure_key = cache_key
+        self._structure_cache = structure
         return structure
 
-    def _generate_ai_rules(self, project_info: Dict[str, Any]) -> Dict[str, Any]:
+    def _bucket_files(self, project_structure: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Sort the project's files into the groups used by the prompts.
+        
+        The result is kept on the structure so both prompts share it.
+        """
+        buckets = project_structure.get('file_buckets')
+        if buckets is not None:
+            return buckets
+
+        # Python-only groups come straight from the lists built during the walk
+        python_files = project_structure.get('files_by_ext', {}).get('.py', [])
+        buckets = {
+            'config': [], 'ide': [], 'build': [], 'support': [], 'templates': [],
+            'python': python_files,
+            'core': [f for f in python_files if not any(x in f.lower() for x in ('setup', 'config'))],
+            'described': project_structure.get('core_py_modules', [])
+        }
+        for f in project_structure.get('files', []):
+            lower = f.lower()
+            ext = os.path.splitext(f)[1] or os.path.basename(f)
+            if ext in self.PROMPT_CONFIG_SUFFIXES:
+                buckets['config'].append(f)
+            if '.vscode' in f or '.idea' in f:
+                buckets['ide'].append(f)
+            if f in self.BUILD_FILES:
+                buckets['build'].append(f)
+            if any(x in lower for x in self.SUPPORT_TOKENS):
+                buckets['support'].append(f)
+            if 'template' in lower:
+                buckets['templates'].append(f)
+
+        project_structure['file_buckets'] = buckets
+        return buckets
+
+    def _generate_ai_rules(self, project_info: Dict[str, Any], project_structure: Dict[str, Any]) -> Dict[str, Any]:
         """Generate rules using Gemini AI based on project analysis."""
         try:
-            # Analyze project
-            project_structure = self._analyze_project_structure()
-            
-            # Create detailed prompt
-            prompt = f"""As an AI assistant working in Cursor IDE, analyze this project to understand how you should behave and generate code that perfectly matches the project's patterns and standards.
+            self._ensure_model()
+            buckets = self._bucket_files(project_structure)
+            by_file = project_structure['patterns']['by_file']
+
+            # Create detailed prompt; sections are collected and joined once
+            parts = [f"""As an AI assistant working in Cursor IDE, analyze this project to understand how you should behave and generate code that perfectly matches the project's patterns and standards.
 
 Project Overview:
 Language: {project_info.get('language', 'unknown')}
@@ -187,33 +467,32 @@ Project Metrics:
   - Config Files: {len(project_structure['config_files'])}
 - Dependencies:
   - Frameworks: {', '.join(project_structure['frameworks']) or 'none'}
-  - Core Dependencies: {', '.join(list(project_structure['dependencies'].keys())[:10])}
+  - Core Dependencies: {', '.join(name for name, _ in project_structure['patterns']['imports'].most_common(10))}
   - Total Dependencies: {len(project_structure['dependencies'])}
 
 Project Ecosystem:
 1. Development Environment:
-- Project Structure:
-{chr(10).join([f"- {f}" for f in project_structure['files'] if f.endswith(('.json', '.md', '.env', '.gitignore'))][:5])}
-- IDE Configuration:
-{chr(10).join([f"- {f}" for f in project_structure['files'] if '.vscode' in f or '.idea' in f][:5])}
-- Build System:
-{chr(10).join([f"- {f}" for f in project_structure['files'] if f in ['setup.py', 'requirements.txt', 'package.json', 'Makefile']])}
-
-2. Project Components:
-- Core Modules:
-{chr(10).join([f"- {f}: {sum(1 for p in project_structure['patterns']['function_patterns'] if p['file'] == f)} functions" for f in project_structure['files'] if f.endswith('.py') and not any(x in f.lower() for x in ['setup', 'config'])][:5])}
-- Support Modules:
-{chr(10).join([f"- {f}" for f in project_structure['files'] if any(x in f.lower() for x in ['util', 'helper', 'common', 'shared'])][:5])}
-- Templates:
-{chr(10).join([f"- {f}" for f in project_structure['files'] if 'template' in f.lower()][:5])}
-
-3. Module Organization Analysis:
-- Core Module Functions:
-{chr(10).join([f"- {f}: Primary module handling {f.split('_')[0].title()} functionality" for f in project_structure['files'] if f.endswith('.py') and not any(x in f.lower() for x in ['setup', 'config'])][:5])}
-
-- Module Dependencies:
-{chr(10).join([f"- {f} depends on: {', '.join(list(set([imp.split('.')[0] for imp in project_structure['patterns']['imports'] if imp in f])))}" for f in project_structure['files'] if f.endswith('.py')][:5])}
+- Project Structure:"""]
+            parts.append(_lines((f"- {f}" for f in buckets['config']), 5))
+            parts.append("- IDE Configuration:")
+            parts.append(_lines((f"- {f}" for f in buckets['ide']), 5))
+            parts.append("- Build System:")
+            parts.append(_lines(f"- {f}" for f in buckets['build']))
+
+            parts.append("\n2. Project Components:\n- Core Modules:")
+            parts.append(_lines((f"- {f}: {len(by_file[f]['functions'])} functions" for f in buckets['core']), 5))
+            parts.append("- Support Modules:")
+            parts.append(_lines((f"- {f}" for f in buckets['support']), 5))
+            parts.append("- Templates:")
+            parts.append(_lines((f"- {f}" for f in buckets['templates']), 5))
+
+            parts.append("\n3. Module Organization Analysis:\n- Core Module Functions:")
+            parts.append(_lines((f"- {f}: Primary module handling {f.split('_')[0].title()} functionality" for f in buckets['core']), 5))
+            parts.append("\n- Module Dependencies:")
+            imports = project_structure['patterns']['imports']
+            parts.append(_lines((f"- {f} depends on: {', '.join(set(imp.split('.')[0] for imp in imports if imp in f))}" for f in buckets['python']), 5))
 
+            parts.append("""
 - Module Responsibilities:
 Please analyze each module's code and describe its core responsibilities based on:
 1. Function and class names
@@ -234,9 +513,10 @@ Based on the codebase analysis, identify and describe:
 6. Error handling strategies
 7. Performance optimization patterns
 
-Code Sample Analysis:
-{chr(10).join(f"File: {file}:{chr(10)}{content[:10000]}..." for file, content in list(project_structure['code_contents'].items())[:50])}
+Code Sample Analysis:""")
+            parts.append(_lines((f"File: {file}:{NL}{content}..." for file, content in project_structure['code_contents'].items()), self.CODE_SAMPLE_FILES))
 
+            parts.append("""
 Based on this detailed analysis, create behavior rules for AI to:
 1. Replicate the project's exact code style and patterns
 2. Match naming conventions precisely
@@ -249,29 +529,29 @@ Based on this detailed analysis, create behavior rules for AI to:
 9. Follow configuration patterns
 
 Return a JSON object defining AI behavior rules:
-{{"ai_behavior": {{
-    "code_generation": {{
-        "style": {{
+{"ai_behavior": {
+    "code_generation": {
+        "style": {
             "prefer": [],
             "avoid": []
-        }},
-        "error_handling": {{
+        },
+        "error_handling": {
             "prefer": [],
             "avoid": []
-        }},
-        "performance": {{
+        },
+        "performance": {
             "prefer": [],
             "avoid": []
-        }},
-        "module_organization": {{
+        },
+        "module_organization": {
             "structure": [],  # Analyze and describe the current module structure
             "dependencies": [],  # Analyze actual dependencies between modules
-            "responsibilities": {{}},  # Analyze and describe each module's core responsibilities
+            "responsibilities": {},  # Analyze and describe each module's core responsibilities
             "rules": [],  # Extract rules from actual code organization patterns
-            "naming": {{}}  # Extract naming conventions from actual code
-        }}
-    }}
-}}}}
+            "naming": {}  # Extract naming conventions from actual code
+        }
+    }
+}}
 
 Critical Guidelines for AI:
 1. NEVER deviate from existing code patterns
@@ -283,13 +563,14 @@ Critical Guidelines for AI:
 7. UNDERSTAND pattern purposes
 8. FOLLOW existing workflows
 9. RESPECT current architecture
-10. MIRROR documentation style"""
+10. MIRROR documentation style""")
+            prompt = NL.join(parts)
 
             # Get AI response
             response = self.chat_session.send_message(prompt)
             
             # Extract JSON
-            json_match = re.search(r'({[\s\S]*})', response.text)
+            json_match = self.JSON_BLOCK_RE.search(response.text)
             if not json_match:
                 print("⚠️ No JSON found in AI response")
                 raise ValueError("Invalid AI response format")
@@ -297,7 +578,8 @@ Critical Guidelines for AI:
             json_str = json_match.group(1)
             
             try:
-                ai_rules = json.loads(json_str)
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError
+                ai_rules = orjson.loads(json_str) if orjson else json.loads(json_str)
                 
                 if not isinstance(ai_rules, dict) or 'ai_behavior' not in ai_rules:
                     print("⚠️ Invalid JSON structure in AI response")
@@ -316,17 +598,18 @@ Critical Guidelines for AI:
     def _generate_project_description(self, project_structure: Dict[str, Any]) -> str:
         """Generate project description using AI based on project analysis."""
         try:
+            self._ensure_model()
             # Analyze core modules
             core_modules = []
-            for file in project_structure.get('files', []):
-                if file.endswith('.py') and not any(x in file.lower() for x in ['setup', 'config', 'test']):
-                    module_info = {
-                        'name': file,
-                        'classes': [c for c in project_structure['patterns']['class_patterns'] if c['file'] == file],
-                        'functions': [f for f in project_structure['patterns']['function_patterns'] if f['file'] == file],
-                        'imports': [imp for imp in project_structure['patterns']['imports'] if imp in file]
-                    }
-                    core_modules.append(module_info)
+            for file in self._bucket_files(project_structure)['described']:
+                file_patterns = project_structure['patterns']['by_file'][file]
+                module_info = {
+                    'name': file,
+                    'classes': file_patterns['classes'],
+                    'functions': file_patterns['functions'],
+                    'imports': file_patterns['imports']
+                }
+                core_modules.append(module_info)
 
             # Analyze main patterns
             main_patterns = {
@@ -336,15 +619,14 @@ Critical Guidelines for AI:
             }
 
             # Create detailed prompt for AI
-            prompt = f"""Analyze this project structure and create a detailed description (2-3 sentences) that captures its essence:
+            parts = ["""Analyze this project structure and create a detailed description (2-3 sentences) that captures its essence:
 
 Project Overview:
-1. Core Modules Analysis:
-{chr(10).join([f"- {m['name']}: {len(m['classes'])} classes, {len(m['functions'])} functions" for m in core_modules])}
-
-2. Module Responsibilities:
-{chr(10).join([f"- {m['name']}: Main purpose indicated by {', '.join([c['name'] for c in m['classes'][:2]])}" for m in core_modules if m['classes']])}
-
+1. Core Modules Analysis:"""]
+            parts.append(_lines(f"- {m['name']}: {len(m['classes'])} classes, {len(m['functions'])} functions" for m in core_modules))
+            parts.append("\n2. Module Responsibilities:")
+            parts.append(_lines(f"- {m['name']}: Main purpose indicated by {', '.join(c['name'] for c in m['classes'][:2])}" for m in core_modules if m['classes']))
+            parts.append(f"""
 3. Technical Implementation:
 - Error Handling: {len(main_patterns['error_handling'])} patterns found
 - Performance Optimizations: {len(main_patterns['performance'])} patterns found
@@ -353,7 +635,7 @@ Project Overview:
 4. Project Architecture:
 - Total Files: {len(project_structure.get('files', []))}
 - Core Python Modules: {len(core_modules)}
-- External Dependencies: {len(project_structure.get('dependencies', {}))}
+- External Dependencies: {len(project_structure.get('dependencies', ()))}
 
 Based on this analysis, create a description that covers:
 1. The project's main purpose and functionality
@@ -362,7 +644,8 @@ Based on this analysis, create a description that covers:
 4. Unique characteristics or innovations
 
 Format: Return a clear, concise description focusing on what makes this project unique.
-Do not include technical metrics in the description."""
+Do not include technical metrics in the description.""")
+            prompt = NL.join(parts)
 
             # Get AI response
             response = self.chat_session.send_message(prompt)
@@ -381,15 +664,15 @@ Do not include technical metrics in the description."""
     def generate_rules_file(self, project_info: Dict[str, Any] = None) -> str:
         """Generate the .cursorrules file based on project analysis and AI suggestions."""
         try:
-            # Use analyzer if no project_info provided
-            if project_info is None:
-                project_info = self.analyzer.analyze_project_for_rules()
-            
             # Analyze project structure
             project_structure = self._analyze_project_structure()
             
+            # Use analyzer if no project_info provided; it reuses the walk above
+            if project_info is None:
+                project_info = self.analyzer.analyze_project_for_rules(project_structure['extension_counts'])
+            
             # Generate AI rules
-            ai_rules = self._generate_ai_rules(project_info)
+            ai_rules = self._generate_ai_rules(project_info, project_structure)
             
             # Generate project description
             description = self._generate_project_description(project_structure)
@@ -407,8 +690,13 @@ Do not include technical metrics in the description."""
             
             # Write to file
             rules_file = os.path.join(self.project_path, '.cursorrules')
-            with open(rules_file, 'w', encoding='utf-8') as f:
-                json.dump(rules, f, indent=2)
+            if orjson:
+                with open(rules_file, 'wb') as f:
+                    f.write(orjson.dumps(rules, option=orjson.OPT_INDENT_2))
+            else:
+                # ensure_ascii=False matches orjson, which writes UTF-8 as is
+                with open(rules_file, 'w', encoding='utf-8') as f:
+                    json.dump(rules, f, indent=2, ensure_ascii=False)
             
             return rules_file
                 
@@ -416,47 +704,94 @@ Do not include technical metrics in the description."""
             print(f"❌ Failed to generate rules: {e}")
             raise 
 
+    def _scan_python_imports(self, content: str) -> List[str]:
+        """Find imported module names by splitting import statements."""
+        imports = []
+        for line in content.split('\n'):
+            stripped = line.lstrip()
+            if stripped.startswith('from'):
+                # from <module> import ...
+                words = stripped.split(None, 3)
+                if (len(words) >= 3 and words[0] == 'from' and words[2] == 'import'
+                        and self.MODULE_NAME_CHARS.issuperset(words[1])):
+                    imports.append(words[1])
+            elif stripped.startswith('import'):
+                # import <module> [as <name>], ...
+                words = stripped.partition('#')[0].split(None, 1)
+                if len(words) != 2 or words[0] != 'import':
+                    continue
+                names = []
+                for part in words[1].split(','):
+                    tokens = part.split()
+                    if not tokens:
+                        continue
+                    if len(tokens) == 2 or len(tokens) > 3 or (len(tokens) == 3 and tokens[1] != 'as'):
+                        # Prose such as "import the file" in a docstring
+                        names = []
+                        break
+                    names.append(tokens[0])
+                if all(self.MODULE_NAME_CHARS.issuperset(name) for name in names):
+                    imports.extend(names)
+        return imports
+
+    def _scan_includes(self, content: str) -> List[str]:
+        """Find #include targets with literal searches instead of a regex."""
+        includes = []
+        length = len(content)
+        pos = content.find('#include')
+        while pos != -1:
+            i = pos + 8
+            while i < length and content[i].isspace():
+                i += 1
+            if i < length and content[i] in '<"':
+                ends = [e for e in (content.find('>', i + 1), content.find('"', i + 1)) if e != -1]
+                end = min(ends) if ends else -1
+                if end > i + 1:
+                    includes.append(content[i + 1:end])
+                    i = end + 1
+            pos = content.find('#include', i)
+        return includes
+
     def _analyze_python_file(self, content: str, rel_path: str, structure: Dict[str, Any]):
         """Analyze Python file content."""
         # Find imports and dependencies
-        imports = re.findall(self.IMPORT_PATTERNS['python'], content, re.MULTILINE)
-        structure['dependencies'].update({imp: True for imp in imports})
-        structure['patterns']['imports'].extend(imports)
-        
-        # Find classes and their patterns
-        class_patterns = re.finditer(self.CLASS_PATTERNS['python'], content)
-        for match in class_patterns:
-            class_name = match.group(1)
-            inheritance = match.group(2) if match.group(2) else ''
-            structure['patterns']['class_patterns'].append({
-                'name': class_name,
-                'inheritance': inheritance,
-                'file': rel_path
-            })
-        
-        # Find and analyze functions
-        function_patterns = re.finditer(self.FUNCTION_PATTERNS['python'], content)
-        for match in function_patterns:
-            func_name = match.group(1)
-            params = match.group(2)
-            return_type = match.group(3) if match.group(3) else None
-            structure['patterns']['function_patterns'].append({
-                'name': func_name,
-                'parameters': params,
-                'return_type': return_type,
-                'file': rel_path
-            })
+        imports = self._scan_python_imports(content)
+
+        # One pass over the content; dispatch on which alternative matched.
+        # Here and in the other analyzers, a substring check on a keyword the
+        # pattern requires skips regex passes that cannot match.
+        groups = self.PYTHON_SCANNER.groupindex
+        matches = self.PYTHON_SCANNER.finditer(content) if 'class' in content or 'def' in content else ()
+        for match in matches:
+            kind = match.lastgroup
+            base = groups[kind]
+            if kind == 'cls':
+                structure['patterns']['class_patterns'].append({
+                    'name': match.group(base + 1),
+                    'inheritance': match.group(base + 2) or '',
+                    'file': rel_path
+                })
+            else:
+                structure['patterns']['function_patterns'].append({
+                    'name': match.group(base + 1),
+                    'parameters': match.group(base + 2),
+                    'return_type': match.group(base + 3) or None,
+                    'file': rel_path
+                })
+
+        structure['dependencies'].update(imports)
+        structure['patterns']['imports'].update(imports)
 
     def _analyze_js_file(self, content: str, rel_path: str, structure: Dict[str, Any]):
         """Analyze JavaScript file content."""
         # Find imports
-        imports = re.findall(self.IMPORT_PATTERNS['javascript'], content)
+        imports = self.IMPORT_RE['javascript'].findall(content)
         imports = [imp[0] or imp[1] for imp in imports]  # Flatten tuples from regex groups
-        structure['dependencies'].update({imp: True for imp in imports})
-        structure['patterns']['imports'].extend(imports)
+        structure['dependencies'].update(imports)
+        structure['patterns']['imports'].update(imports)
         
         # Find classes
-        classes = re.finditer(self.CLASS_PATTERNS['javascript'], content)
+        classes = self.CLASS_RE['javascript'].finditer(content) if 'class' in content else ()
         for match in classes:
             structure['patterns']['class_patterns'].append({
                 'name': match.group(1),
@@ -465,7 +800,7 @@ Do not include technical metrics in the description."""
             })
         
         # Find functions (including arrow functions)
-        functions = re.finditer(self.FUNCTION_PATTERNS['javascript'], content)
+        functions = self.FUNCTION_RE['javascript'].finditer(content, **SCAN_KWARGS)
         for match in functions:
             name = match.group(1) or match.group(2)  # Get name from either function or variable
             structure['patterns']['function_patterns'].append({
@@ -475,7 +810,7 @@ Do not include technical metrics in the description."""
             })
             
         # Find object methods
-        methods = re.finditer(self.METHOD_PATTERN, content)
+        methods = self.METHOD_RE.finditer(content, **SCAN_KWARGS)
         for match in methods:
             structure['patterns']['function_patterns'].append({
                 'name': match.group(1),
@@ -485,7 +820,7 @@ Do not include technical metrics in the description."""
             })
             
         # Find variables and constants
-        variables = re.finditer(self.VARIABLE_PATTERN, content)
+        variables = self.VARIABLE_RE.finditer(content)
         for match in variables:
             structure['patterns']['variable_patterns'].append({
                 'name': match.group(1),
@@ -494,7 +829,7 @@ Do not include technical metrics in the description."""
             })
             
         # Find error handling patterns
-        try_blocks = re.finditer(self.ERROR_PATTERN, content)
+        try_blocks = self.ERROR_RE.finditer(content) if 'catch' in content else ()
         for match in try_blocks:
             structure['patterns']['error_patterns'].append({
                 'exception_var': match.group(1),
@@ -511,12 +846,12 @@ Do not include technical metrics in the description."""
     def _analyze_kotlin_file(self, content: str, rel_path: str, structure: Dict[str, Any]):
         """Analyze Kotlin file content."""
         # Find imports
-        imports = re.findall(self.IMPORT_PATTERNS['kotlin'], content)
-        structure['dependencies'].update({imp: True for imp in imports})
-        structure['patterns']['imports'].extend(imports)
+        imports = self.IMPORT_RE['kotlin'].findall(content)
+        structure['dependencies'].update(imports)
+        structure['patterns']['imports'].update(imports)
         
         # Find classes
-        classes = re.finditer(self.CLASS_PATTERNS['kotlin'], content)
+        classes = self.CLASS_RE['kotlin'].finditer(content)
         for match in classes:
             structure['patterns']['class_patterns'].append({
                 'name': match.group(1),
@@ -525,7 +860,7 @@ Do not include technical metrics in the description."""
             })
         
         # Find functions
-        functions = re.finditer(self.FUNCTION_PATTERNS['kotlin'], content)
+        functions = self.FUNCTION_RE['kotlin'].finditer(content) if 'fun' in content else ()
         for match in functions:
             structure['patterns']['function_patterns'].append({
                 'name': match.group(1),
@@ -537,12 +872,12 @@ Do not include technical metrics in the description."""
     def _analyze_php_file(self, content: str, rel_path: str, structure: Dict[str, Any]):
         """Analyze PHP file content."""
         # Find imports/requires
-        imports = re.findall(self.IMPORT_PATTERNS['php'], content)
-        structure['dependencies'].update({imp: True for imp in imports})
-        structure['patterns']['imports'].extend(imports)
+        imports = self.IMPORT_RE['php'].findall(content)
+        structure['dependencies'].update(imports)
+        structure['patterns']['imports'].update(imports)
         
         # Find classes
-        classes = re.finditer(self.CLASS_PATTERNS['php'], content)
+        classes = self.CLASS_RE['php'].finditer(content) if 'class' in content else ()
         for match in classes:
             structure['patterns']['class_patterns'].append({
                 'name': match.group(1),
@@ -552,7 +887,7 @@ Do not include technical metrics in the description."""
             })
         
         # Find functions
-        functions = re.finditer(self.FUNCTION_PATTERNS['php'], content)
+        functions = self.FUNCTION_RE['php'].finditer(content, **SCAN_KWARGS) if 'function' in content else ()
         for match in functions:
             structure['patterns']['function_patterns'].append({
                 'name': match.group(1),
@@ -564,12 +899,12 @@ Do not include technical metrics in the description."""
     def _analyze_swift_file(self, content: str, rel_path: str, structure: Dict[str, Any]):
         """Analyze Swift file content."""
         # Find imports
-        imports = re.findall(self.IMPORT_PATTERNS['swift'], content)
-        structure['dependencies'].update({imp: True for imp in imports})
-        structure['patterns']['imports'].extend(imports)
+        imports = self.IMPORT_RE['swift'].findall(content)
+        structure['dependencies'].update(imports)
+        structure['patterns']['imports'].update(imports)
         
         # Find classes and protocols
-        classes = re.finditer(self.CLASS_PATTERNS['swift'], content)
+        classes = self.CLASS_RE['swift'].finditer(content)
         for match in classes:
             structure['patterns']['class_patterns'].append({
                 'name': match.group(1),
@@ -578,7 +913,7 @@ Do not include technical metrics in the description."""
             })
         
         # Find functions
-        functions = re.finditer(self.FUNCTION_PATTERNS['swift'], content)
+        functions = self.FUNCTION_RE['swift'].finditer(content) if 'func' in content else ()
         for match in functions:
             structure['patterns']['function_patterns'].append({
                 'name': match.group(1),
@@ -590,12 +925,12 @@ Do not include technical metrics in the description."""
     def _analyze_ts_file(self, content: str, rel_path: str, structure: Dict[str, Any]):
         """Analyze TypeScript/TSX file content."""
         # Find imports
-        imports = re.findall(self.IMPORT_PATTERNS['typescript'], content)
-        structure['dependencies'].update({imp: True for imp in imports})
-        structure['patterns']['imports'].extend(imports)
+        imports = self.IMPORT_RE['typescript'].findall(content)
+        structure['dependencies'].update(imports)
+        structure['patterns']['imports'].update(imports)
         
         # Find interfaces and types
-        interfaces = re.finditer(self.INTERFACE_PATTERN, content)
+        interfaces = self.INTERFACE_RE.finditer(content) if 'interface' in content or 'type' in content else ()
         for match in interfaces:
             structure['patterns']['class_patterns'].append({
                 'name': match.group(1),
@@ -605,7 +940,7 @@ Do not include technical metrics in the description."""
             })
         
         # Find classes and components
-        classes = re.finditer(self.CLASS_PATTERNS['typescript'], content)
+        classes = self.CLASS_RE['typescript'].finditer(content)
         for match in classes:
             structure['patterns']['class_patterns'].append({
                 'name': match.group(1),
@@ -615,10 +950,10 @@ Do not include technical metrics in the description."""
             })
         
         # Find functions and hooks
-        functions = re.finditer(self.FUNCTION_PATTERNS['typescript'], content)
+        functions = self.FUNCTION_RE['typescript'].finditer(content, **SCAN_KWARGS)
         for match in functions:
             name = match.group(1)
-            is_hook = name.startswith('use') and name[3].isupper()
+            is_hook = name.startswith('use') and name[3:4].isupper()
             structure['patterns']['function_patterns'].append({
                 'name': name,
                 'type': 'hook' if is_hook else 'function',
@@ -629,7 +964,7 @@ Do not include technical metrics in the description."""
         
         # Find JSX components in TSX files
         if rel_path.endswith('.tsx'):
-            components = re.finditer(self.JSX_COMPONENT_PATTERN, content)
+            components = self.JSX_COMPONENT_RE.finditer(content)
             for match in components:
                 component_name = match.group(1)
                 if component_name[0].isupper():  # Custom components start with uppercase
@@ -642,12 +977,12 @@ Do not include technical metrics in the description."""
     def _analyze_cpp_file(self, content: str, rel_path: str, structure: Dict[str, Any]):
         """Analyze C++ file content."""
         # Find includes
-        includes = re.findall(self.IMPORT_PATTERNS['cpp'], content)
-        structure['dependencies'].update({inc: True for inc in includes})
-        structure['patterns']['imports'].extend(includes)
+        includes = self._scan_includes(content)
+        structure['dependencies'].update(includes)
+        structure['patterns']['imports'].update(includes)
         
         # Find classes and structs
-        classes = re.finditer(self.CLASS_PATTERNS['cpp'], content)
+        classes = self.CLASS_RE['cpp'].finditer(content)
         for match in classes:
             structure['patterns']['class_patterns'].append({
                 'name': match.group(1),
@@ -656,7 +991,7 @@ Do not include technical metrics in the description."""
             })
         
         # Find functions and methods
-        functions = re.finditer(self.FUNCTION_PATTERNS['cpp'], content)
+        functions = self.FUNCTION_RE['cpp'].finditer(content)
         for match in functions:
             structure['patterns']['function_patterns'].append({
                 'name': match.group(1),
@@ -664,33 +999,34 @@ Do not include technical metrics in the description."""
                 'file': rel_path
             })
             
-        # Find templates
-        templates = re.finditer(r'template\s*<([^>]+)>', content)
-        for match in templates:
-            structure['patterns']['code_organization'].append({
-                'type': 'template',
-                'parameters': match.group(1),
-                'file': rel_path
-            })
-            
-        # Find namespaces
-        namespaces = re.finditer(r'namespace\s+(\w+)\s*{', content)
-        for match in namespaces:
-            structure['patterns']['code_organization'].append({
-                'type': 'namespace',
-                'name': match.group(1),
-                'file': rel_path
-            })
+        # Find templates and namespaces
+        groups = self.CPP_ORGANIZATION_SCANNER.groupindex
+        matches = self.CPP_ORGANIZATION_SCANNER.finditer(content) if 'template' in content or 'namespace' in content else ()
+        for match in matches:
+            kind = match.lastgroup
+            base = groups[kind]
+            if kind == 'template':
+                structure['patterns']['code_organization'].append({
+                    'type': 'template',
+                    'parameters': match.group(base + 1),
+                    'file': rel_path
+                })
+            else:
+                structure['patterns']['code_organization'].append({
+                    'type': 'namespace',
+                    'name': match.group(base + 1),
+                    'file': rel_path
+                })
 
     def _analyze_c_file(self, content: str, rel_path: str, structure: Dict[str, Any]):
         """Analyze C file content."""
         # Find includes
-        includes = re.findall(self.IMPORT_PATTERNS['c'], content)
-        structure['dependencies'].update({inc: True for inc in includes})
-        structure['patterns']['imports'].extend(includes)
+        includes = self._scan_includes(content)
+        structure['dependencies'].update(includes)
+        structure['patterns']['imports'].update(includes)
         
         # Find structs and unions
-        structs = re.finditer(self.CLASS_PATTERNS['c'], content)
+        structs = self.CLASS_RE['c'].finditer(content)
         for match in structs:
             structure['patterns']['class_patterns'].append({
                 'name': match.group(1),
@@ -699,7 +1035,7 @@ Do not include technical metrics in the description."""
             })
         
         # Find functions
-        functions = re.finditer(self.FUNCTION_PATTERNS['c'], content)
+        functions = self.FUNCTION_RE['c'].finditer(content)
         for match in functions:
             structure['patterns']['function_patterns'].append({
                 'name': match.group(1),
@@ -707,23 +1043,24 @@ Do not include technical metrics in the description."""
                 'file': rel_path
             })
             
-        # Find macros
-        macros = re.finditer(r'#define\s+(\w+)(?:\(([^)]*)\))?\s+(.+)', content)
-        for match in macros:
-            structure['patterns']['code_organization'].append({
-                'type': 'macro',
-                'name': match.group(1),
-                'parameters': match.group(2) if match.group(2) else '',
-                'value': match.group(3),
-                'file': rel_path
-            })
-            
-        # Find typedefs
-        typedefs = re.finditer(r'typedef\s+(?:struct|enum|union)?\s*(\w+)\s+(\w+);', content)
-        for match in typedefs:
-            structure['patterns']['code_organization'].append({
-                'type': 'typedef',
-                'original_type': match.group(1),
-                'new_type': match.group(2),
-                'file': rel_path
-            }) 
\ No newline at end of file
+        # Find macros and typedefs
+        groups = self.C_ORGANIZATION_SCANNER.groupindex
+        matches = self.C_ORGANIZATION_SCANNER.finditer(content) if '#define' in content or 'typedef' in content else ()
+        for match in matches:
+            kind = match.lastgroup
+            base = groups[kind]
+            if kind == 'macro':
+                structure['patterns']['code_organization'].append({
+                    'type': 'macro',
+                    'name': match.group(base + 1),
+                    'parameters': match.group(base + 2) if match.group(base + 2) else '',
+                    'value': match.group(base + 3),
+                    'file': rel_path
+                })
+            else:
+                structure['patterns']['code_organization'].append({
+                    'type': 'typedef',
+                    'original_type': match.group(base + 1),
+                    'new_type': match.group(base + 2),
+                    'file': rel_path
+                }) 
@@ -1,10 +1,39 @@
 import os
 import time
-from typing import Dict, Any
+import functools
+import threading
+from typing import Dict, Any, Callable, List, Tuple
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.observers.polling import PollingObserver
+from watchdog.events import FileSystemEventHandler, DirModifiedEvent
 from rules_generator import RulesGenerator
 from project_detector import detect_project_type
+from config import get_ignore_matchers
+
+# Filesystems where inotify/FSEvents do not see remote changes
+NETWORK_FILESYSTEMS = {
+    'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', 'sshfs', 'fuse.sshfs', 'afpfs', '9p'
+}
+
+def is_network_mount(path: str) -> bool:
+    """Check whether a path lives on a network filesystem (Linux only)."""
+    try:
+        with open('/proc/mounts', 'r') as f:
+            mounts = [line.split() for line in f]
+    except OSError:
+        return False
+
+    path = os.path.realpath(path)
+    best_match, fs_type = '', ''
+    for fields in mounts:
+        if len(fields) < 3:
+            continue
+        mount_point = fields[1].replace('\\040', ' ')
+        prefix = mount_point.rstrip('/') + '/'
+        if (path == mount_point or path.startswith(prefix)) and len(mount_point) > len(best_match):
+            best_match, fs_type = mount_point, fields[2]
+
+    return fs_type in NETWORK_FILESYSTEMS
 
 class RulesWatcher(FileSystemEventHandler):
     def __init__(self, project_path: str, project_id: str):
@@ -72,18 +101,99 @@ class RulesWatcher(FileSystemEventHandler):
         status = "enabled" if enabled else "disabled"
         print(f"Auto-update of .cursorrules is now {status} for project {self.project_id}")
 
+class FocusChangeHandler(FileSystemEventHandler):
+    """Signal that Focus.md needs regenerating when project files change."""
+
+    def __init__(self, project_path: str, on_change: Callable[[], None], config: Dict[str, Any] = None):
+        self.project_path = project_path
+        self.on_change = on_change
+        self.ignored_directories, self.ignored_files_spec, _ = get_ignore_matchers(config or {})
+
+    def on_created(self, event):
+        self._dispatch_change(event)
+
+    def on_modified(self, event):
+        self._dispatch_change(event)
+
+    def on_deleted(self, event):
+        self._dispatch_change(event)
+
+    def on_moved(self, event):
+        self._dispatch_change(event)
+
+    def _dispatch_change(self, event):
+        # A directory's own modification only mirrors changes to its entries,
+        # which arrive as events of their own; creating, deleting or moving a
+        # directory changes the tree shown in Focus.md
+        if isinstance(event, DirModifiedEvent):
+            return
+
+        paths = [event.src_path, getattr(event, 'dest_path', '')]
+        if all(not path or self._should_ignore(path, event.is_directory) for path in paths):
+            return
+
+        self.on_change()
+
+    def _should_ignore(self, file_path: str, is_directory: bool = False) -> bool:
+        """Check if a changed path is irrelevant to Focus.md content."""
+        rel_path = os.path.relpath(file_path, self.project_path)
+        parts = rel_path.split(os.path.sep)
+
+        # A directory is irrelevant if it or any parent is an ignored directory
+        if is_directory:
+            return not self.ignored_directories.isdisjoint(parts)
+
+        filename = parts[-1]
+
+        # Writing Focus.md (via a temp file) must not trigger another regeneration
+        if filename == 'Focus.md' or (filename.startswith('.Focus.md.') and filename.endswith('.tmp')):
+            return True
+
+        if not self.ignored_directories.isdisjoint(parts[:-1]):
+            return True
+
+        return bool(self.ignored_files_spec and self.ignored_files_spec.match(filename))
+
 class ProjectWatcherManager:
+    """Watch many projects through one shared observer thread.
+    
+    All projects are scheduled on a single native Observer (one inotify/FSEvents
+    handle and dispatch thread); projects on network mounts share a single
+    PollingObserver instead.
+    """
+
     def __init__(self):
-        self.observers: Dict[str, Any] = {}
+        self.observer = None
+        self.polling_observer = None
+        self.scheduled: Dict[str, List[Tuple[Any, FileSystemEventHandler, Any]]] = {}
         self.watchers: Dict[str, RulesWatcher] = {}
+        self._lock = threading.Lock()
+
+    def _get_observer(self, project_path: str, config: Dict[str, Any]):
+        """Get (and lazily start) the shared observer suited to a project path."""
+        # Native watchers miss remote changes on network mounts, so poll there
+        if is_network_mount(project_path):
+            if self.polling_observer is None:
+                self.polling_observer = PollingObserver(timeout=config.get('poll_fallback_interval', 5))
+                self.polling_observer.start()
+            return self.polling_observer
 
-    def add_project(self, project_path: str, project_id: str = None) -> str:
+        if self.observer is None:
+            self.observer = Observer()
+            self.observer.start()
+        return self.observer
+
+    def add_project(self, project_path: str, project_id: str = None,
+                    on_change: Callable[[], None] = None, config: Dict[str, Any] = None) -> str:
         """Add a new project to watch.
         
         Args:
             project_path: Path to the project directory
             project_id: Optional unique identifier for the project. If not provided,
                        the absolute path will be used as the ID.
+            on_change: Optional callback invoked when a file relevant to Focus.md changes
+            config: Optional project config providing ignore lists and the
+                    'poll_fallback_interval' used on network filesystems
                        
         Returns:
             The project ID used for the watcher
@@ -92,34 +202,45 @@ class ProjectWatcherManager:
             raise ValueError(f"Project path does not exist: {project_path}")
             
         project_id = project_id or os.path.abspath(project_path)
+        config = config or {}
         
-        if project_id in self.observers:
-            print(f"Project {project_id} is already being watched")
-            return project_id
-            
-        event_handler = RulesWatcher(project_path, project_id)
-        observer = Observer()
-        observer.schedule(event_handler, project_path, recursive=True)
-        observer.start()
-        
-        self.observers[project_id] = observer
-        self.watchers[project_id] = event_handler
+        with self._lock:
+            if project_id in self.scheduled:
+                print(f"Project {project_id} is already being watched")
+                return project_id
+                
+            observer = self._get_observer(project_path, config)
+            event_handler = RulesWatcher(project_path, project_id)
+            handlers = [event_handler]
+            if on_change:
+                handlers.append(FocusChangeHandler(project_path, on_change, config))
+
+            self.scheduled[project_id] = [
+                (observer, handler, observer.schedule(handler, project_path, recursive=True))
+                for handler in handlers
+            ]
+            self.watchers[project_id] = event_handler
         
         print(f"Started watching project {project_id}")
         return project_id
 
     def remove_project(self, project_id: str):
         """Stop watching a project."""
-        if project_id not in self.observers:
-            print(f"Project {project_id} is not being watched")
-            return
-            
-        observer = self.observers[project_id]
-        observer.stop()
-        observer.join()
-        
-        del self.observers[project_id]
-        del self.watchers[project_id]
+        with self._lock:
+            if project_id not in self.scheduled:
+                print(f"Project {project_id} is not being watched")
+                return
+                
+            entries = self.scheduled.pop(project_id)
+            for observer, handler, watch in entries:
+                observer.remove_handler_for_watch(handler, watch)
+
+            # Drop the underlying emitter once no other project shares the path
+            still_watched = {w for others in self.scheduled.values() for _, _, w in others}
+            for observer, watch in {(observer, watch) for observer, _, watch in entries}:
+                if watch not in still_watched:
+                    observer.unschedule(watch)
+            del self.watchers[project_id]
         
         print(f"Stopped watching project {project_id}")
 
@@ -129,9 +250,16 @@ class ProjectWatcherManager:
 
     def stop_all(self):
         """Stop watching all projects."""
-        for project_id in list(self.observers.keys()):
+        for project_id in list(self.scheduled.keys()):
             self.remove_project(project_id)
 
+        for observer in (self.observer, self.polling_observer):
+            if observer is not None:
+                observer.stop()
+                observer.join()
+        self.observer = None
+        self.polling_observer = None
+
     def set_auto_update(self, project_id: str, enabled: bool):
         """Enable or disable auto-update for a specific project."""
         if project_id in self.watchers:
@@ -139,13 +267,18 @@ class ProjectWatcherManager:
         else:
             print(f"Project {project_id} is not being watched")
 
+@functools.lru_cache(maxsize=None)
+def get_watcher_manager() -> ProjectWatcherManager:
+    """Get the process-wide watcher manager shared by all projects."""
+    return ProjectWatcherManager()
+
 def start_watching(project_paths: str | list[str]):
     """Start watching one or multiple project directories for changes.
     
     Args:
         project_paths: A single project path or list of project paths to watch
     """
-    manager = ProjectWatcherManager()
+    manager = get_watcher_manager()
     
     if isinstance(project_paths, str):
         project_paths = [project_paths]
@@ -1,81 +1,121 @@
 #!/usr/bin/env python3
 import os
+import sys
+import copy
 import json
 import argparse
-import logging
-from project_detector import scan_for_projects
+
+from config import write_atomic
+
+try:
+    # Optional: faster JSON parsing and serialization
+    import orjson
+except ImportError:
+    orjson = None
+
+_parser = None
+
+def _get_parser():
+    """Build the argument parser on first use and reuse it afterwards."""
+    global _parser
+    if _parser is None:
+        _parser = argparse.ArgumentParser(description='Set up CursorFocus for your projects')
+        _parser.add_argument('--projects', '-p', nargs='+', help='Paths to projects to monitor')
+        _parser.add_argument('--names', '-n', nargs='+', help='Names for the projects (optional)')
+        _parser.add_argument('--intervals', '-i', nargs='+', type=int, help='Update intervals in seconds for each project')
+        _parser.add_argument('--depths', '-d', nargs='+', type=int, help='Maximum directory depths for each project')
+        _parser.add_argument('--list', '-l', action='store_true', help='List all configured projects')
+        _parser.add_argument('--remove', '-r', nargs='+', help='Remove projects by name or index')
+        _parser.add_argument('--clear', '-c', action='store_true', help='Remove all projects')
+        _parser.add_argument('--scan', '-s', nargs='?', const='.', help='Scan directory for projects')
+        _parser.add_argument('--scan-depth', type=int, default=3, help='Maximum depth for project scanning')
+        _parser.add_argument('--auto-add', '-a', action='store_true', help='Automatically add all found projects')
+        _parser.add_argument('--sort', choices=['name', 'type', 'language'], help='Sort projects by field')
+        _parser.add_argument('--filter', help='Filter projects by type/language/framework')
+    return _parser
 
 def setup_cursorfocus():
     """Set up CursorFocus for your projects."""
-    parser = argparse.ArgumentParser(description='Set up CursorFocus for your projects')
-    parser.add_argument('--projects', '-p', nargs='+', help='Paths to projects to monitor')
-    parser.add_argument('--names', '-n', nargs='+', help='Names for the projects (optional)')
-    parser.add_argument('--intervals', '-i', nargs='+', type=int, help='Update intervals in seconds for each project')
-    parser.add_argument('--depths', '-d', nargs='+', type=int, help='Maximum directory depths for each project')
-    parser.add_argument('--list', '-l', action='store_true', help='List all configured projects')
-    parser.add_argument('--remove', '-r', nargs='+', help='Remove projects by name or index')
-    parser.add_argument('--clear', '-c', action='store_true', help='Remove all projects')
-    parser.add_argument('--scan', '-s', nargs='?', const='.', help='Scan directory for projects')
-    parser.add_argument('--scan-depth', type=int, default=3, help='Maximum depth for project scanning')
-    parser.add_argument('--auto-add', '-a', action='store_true', help='Automatically add all found projects')
-    parser.add_argument('--sort', choices=['name', 'type', 'language'], help='Sort projects by field')
-    parser.add_argument('--filter', help='Filter projects by type/language/framework')
-    
-    args = parser.parse_args()
     script_dir = os.path.dirname(os.path.abspath(__file__))
     config_path = os.path.join(script_dir, 'config.json')
-    config = load_or_create_config(config_path)
-    
-    if 'projects' not in config:
-        config['projects'] = []
+
+    # A bare --list needs no parser; anything else goes through argparse
+    if sys.argv[1:] in (['--list'], ['-l']):
+        list_projects(load_or_create_config(config_path).get('projects', []))
+        return
+
+    args = _get_parser().parse_args()
+    config = None
+
+    def get_config():
+        """Read config.json the first time a command needs it."""
+        nonlocal config
+        if config is None:
+            config = load_or_create_config(config_path)
+            if 'projects' not in config:
+                config['projects'] = []
+        return config
 
     if args.list:
-        list_projects(config['projects'])
+        list_projects(get_config()['projects'])
         return
 
+    # Mutating commands only set this; config.json is written once at the end
+    dirty = False
+
     if args.clear:
         if confirm_action("Remove all projects?"):
+            config = get_config()
             config['projects'] = []
-            save_config(config_path, config)
+            dirty = True
             print("✅ All projects removed")
-        return
 
-    if args.remove:
-        remove_projects(config, args.remove)
-        save_config(config_path, config)
-        return
+    elif args.remove:
+        config = get_config()
+        dirty = remove_projects(config, args.remove)
 
     # Handle scan option
-    if args.scan is not None:
+    elif args.scan is not None:
+        # Only the scan needs the detector; other commands skip loading it
+        from project_detector import iter_projects
         scan_path = os.path.abspath(args.scan) if args.scan else os.getcwd()
         print(f"🔍 Scanning: {scan_path}")
-        found_projects = scan_for_projects(scan_path, args.scan_depth)
+        found_projects = iter_projects(scan_path, args.scan_depth)
         
         if args.filter:
             filter_term = args.filter.lower()
-            found_projects = [p for p in found_projects if 
+            found_projects = (p for p in found_projects if 
                             filter_term in p['type'].lower() or
                             filter_term in p.get('language', '').lower() or 
-                            filter_term in p.get('framework', '').lower()]
+                            filter_term in p.get('framework', '').lower())
         
         if args.sort:
-            found_projects.sort(key=lambda x: str(x.get(args.sort, '')).lower())
+            # Sorting needs every result, so only unsorted scans are shown as they arrive
+            found_projects = sorted(found_projects, key=lambda x: str(x.get(args.sort, '')).lower())
         
-        if not found_projects:
-            print("❌ No projects found")
-            return
-            
-        print(f"\nFound {len(found_projects)} projects:")
+        listed = []
         for i, project in enumerate(found_projects, 1):
+            if i == 1:
+                print("\nFound projects:")
             print(f"{i}. {project['name']} ({project['type']})")
             print(f"   Path: {project['path']}")
             if project.get('language'): print(f"   Language: {project['language']}")
             if project.get('framework'): print(f"   Framework: {project['framework']}")
+            listed.append(project)
+        found_projects = listed
+        
+        if not found_projects:
+            print("❌ No projects found")
+            return
         
+        # Nothing above needs the config, so a scan that finds nothing never reads it
+        config = get_config()
+        existing_paths = {p['project_path'] for p in config['projects']}
+        added = 0
         if args.auto_add:
-            added = 0
             for project in found_projects:
-                if not any(p['project_path'] == project['path'] for p in config['projects']):
+                if project['path'] not in existing_paths:
+                    existing_paths.add(project['path'])
                     config['projects'].append({
                         'name': project['name'],
                         'project_path': project['path'],
@@ -94,19 +134,23 @@ def setup_cursorfocus():
                 if selection == 'all':
                     indices = range(len(found_projects))
                 else:
+                    # Convert and range-check in one pass, stopping at the first bad token
+                    indices = []
                     try:
-                        indices = [int(i) - 1 for i in selection.split()]
-                        if any(i < 0 or i >= len(found_projects) for i in indices):
-                            print("❌ Invalid numbers")
-                            return
+                        for token in selection.split():
+                            idx = int(token) - 1
+                            if not 0 <= idx < len(found_projects):
+                                print("❌ Invalid numbers")
+                                return
+                            indices.append(idx)
                     except ValueError:
                         print("❌ Invalid input")
                         return
                 
-                added = 0
                 for idx in indices:
                     project = found_projects[idx]
-                    if not any(p['project_path'] == project['path'] for p in config['projects']):
+                    if project['path'] not in existing_paths:
+                        existing_paths.add(project['path'])
                         config['projects'].append({
                             'name': project['name'],
                             'project_path': project['path'],
@@ -122,62 +166,94 @@ def setup_cursorfocus():
                 print("\n❌ Cancelled")
                 return
         
-        if config['projects']:
-            save_config(config_path, config)
-        return
+        dirty = added > 0
+
+    else:
+        config = get_config()
 
-    # Add/update projects
-    if args.projects:
-        valid_projects = []
-        for i, project_path in enumerate(args.projects):
-            abs_path = os.path.abspath(project_path)
-            if not os.path.exists(abs_path):
-                print(f"⚠️ Path not found: {abs_path}")
-                continue
+        # Add/update projects
+        if args.projects:
+            valid_projects = []
+            name_counts = {}  # Repeated names get a " (n)" suffix as they are added
+            path_exists = {}  # abs_path -> exists, so a repeated path is stat'ed once
+            for i, project_path in enumerate(args.projects):
+                abs_path = os.path.abspath(project_path)
+                exists = path_exists.get(abs_path)
+                if exists is None:
+                    exists = path_exists[abs_path] = os.path.exists(abs_path)
+                if not exists:
+                    print(f"⚠️ Path not found: {abs_path}")
+                    continue
                 
-            project_name = args.names[i] if args.names and i < len(args.names) else get_project_name(abs_path)
-            project_config = {
-                'name': project_name,
-                'project_path': abs_path,
-                'update_interval': args.intervals[i] if args.intervals and i < len(args.intervals) else 60,
-                'max_depth': args.depths[i] if args.depths and i < len(args.depths) else 3
-            }
-            valid_projects.append(project_config)
-            
-        names = [p['name'] for p in valid_projects]
-        if len(names) != len(set(names)):
-            name_counts = {}
+                project_name = args.names[i] if args.names and i < len(args.names) else get_project_name(abs_path)
+                count = name_counts.get(project_name, 0) + 1
+                name_counts[project_name] = count
+                project_config = {
+                    'name': f"{project_name} ({count})" if count > 1 else project_name,
+                    'project_path': abs_path,
+                    'update_interval': args.intervals[i] if args.intervals and i < len(args.intervals) else 60,
+                    'max_depth': args.depths[i] if args.depths and i < len(args.depths) else 3
+                }
+                valid_projects.append(project_config)
+        
+            # Path -> configured project; reversed so the first entry for a path wins
+            existing_by_path = {p['project_path']: p for p in reversed(config['projects'])}
             for project in valid_projects:
-                base_name = project['name']
-                if base_name in name_counts:
-                    name_counts[base_name] += 1
-                    project['name'] = f"{base_name} ({name_counts[base_name]})"
+                existing = existing_by_path.get(project['project_path'])
+                if existing:
+                    existing.update(project)
                 else:
-                    name_counts[base_name] = 1
-        
-        for project in valid_projects:
-            existing = next((p for p in config['projects'] if p['project_path'] == project['project_path']), None)
-            if existing:
-                existing.update(project)
-            else:
-                config['projects'].append(project)
-
-    save_config(config_path, config)
-    print("\n📁 Projects:")
-    for project in config['projects']:
-        print(f"\n• {project['name']}")
-        print(f"  Path: {project['project_path']}")
-        print(f"  Update: {project['update_interval']}s")
-        print(f"  Depth: {project['max_depth']}")
+                    config['projects'].append(project)
+                    existing_by_path[project['project_path']] = project
+            dirty = bool(valid_projects)
+
+        # A first run still creates config.json even with no projects given
+        dirty = dirty or not os.path.exists(config_path)
+
+        # Built up front so the whole listing is a single write
+        lines = ["\n📁 Projects:"]
+        for project in config['projects']:
+            lines.append(
+                f"\n• {project['name']}\n"
+                f"  Path: {project['project_path']}\n"
+                f"  Update: {project['update_interval']}s\n"
+                f"  Depth: {project['max_depth']}"
+            )
+        print("\n".join(lines))
     
-    print(f"\nRun: python {os.path.join(script_dir, 'focus.py')}")
+        print(f"\nRun: python {os.path.join(script_dir, 'focus.py')}")
+
+    if dirty:
+        save_config(config_path, config)
+
+# config_path -> ((mtime_ns, size), config) of the last read or write
+_config_cache = {}
 
 def load_or_create_config(config_path):
-    """Load existing config or create default one."""
-    if os.path.exists(config_path):
-        with open(config_path, 'r') as f:
-            return json.load(f)
-    return get_default_config()
+    """Load existing config or create default one.
+    
+    The parsed config is kept per path and reused while the file's mtime
+    and size are unchanged. Callers mutate the result, so each gets a copy.
+    """
+    try:
+        st = os.stat(config_path)
+    except OSError:
+        return get_default_config()
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _config_cache.get(config_path)
+    if cached and cached[0] == signature:
+        return copy.deepcopy(cached[1])
+
+    with open(config_path, 'rb') as f:
+        data = f.read()
+    config = orjson.loads(data) if orjson else json.loads(data)
+    _config_cache[config_path] = (signature, copy.deepcopy(config))
+    return config
+
+def _remember_config(config_path, config):
+    """Cache a snapshot of a config that was just found to match the file on disk."""
+    st = os.stat(config_path)
+    _config_cache[config_path] = ((st.st_mtime_ns, st.st_size), copy.deepcopy(config))
 
 def get_default_config():
     """Return default configuration."""
@@ -201,9 +277,23 @@ def get_default_config():
     }
 
 def save_config(config_path, config):
-    """Save configuration to file."""
-    with open(config_path, 'w') as f:
-        json.dump(config, f, indent=4)
+    """Save configuration to file, atomically and only when it changed."""
+    if orjson:
+        data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    else:
+        # Same bytes as orjson: two-space indent, UTF-8 left unescaped
+        data = json.dumps(config, indent=2, ensure_ascii=False).encode('utf-8')
+
+    try:
+        with open(config_path, 'rb') as f:
+            if f.read() == data:
+                _remember_config(config_path, config)
+                return
+    except FileNotFoundError:
+        pass
+
+    write_atomic(config_path, data)
+    _remember_config(config_path, config)
 
 def list_projects(projects):
     """Display list of configured projects."""
@@ -211,41 +301,38 @@ def list_projects(projects):
         print("\n📁 No projects configured.")
         return
         
-    print("\n📁 Configured projects:")
+    lines = ["\n📁 Configured projects:"]
     for i, project in enumerate(projects, 1):
-        print(f"\n  {i}. {project['name']}:")
-        print(f"     Path: {project['project_path']}")
-        print(f"     Update interval: {project['update_interval']} seconds")
-        print(f"     Max depth: {project['max_depth']} levels")
+        lines.append(
+            f"\n  {i}. {project['name']}:\n"
+            f"     Path: {project['project_path']}\n"
+            f"     Update interval: {project['update_interval']} seconds\n"
+            f"     Max depth: {project['max_depth']} levels"
+        )
+    print("\n".join(lines))
 
 def remove_projects(config, targets):
-    """Remove specific projects by name or index."""
+    """Remove specific projects by name or index; returns whether any were removed."""
     if not config['projects']:
         print("\n⚠️ No projects configured.")
-        return
+        return False
         
+    # Sort targets once into indices and lowercased names
+    target_indices = set()
+    target_names = set()
+    for target in targets:
+        try:
+            target_indices.add(int(target))
+        except ValueError:
+            target_names.add(target.lower())
+
     remaining_projects = []
     removed = []
     
-    for project in config['projects']:
-        should_keep = True
-        
-        for target in targets:
-            # Check if target is an index
-            try:
-                idx = int(target)
-                if idx == config['projects'].index(project) + 1:
-                    should_keep = False
-                    removed.append(project['name'])
-                    break
-            except ValueError:
-                # Target is a name
-                if project['name'].lower() == target.lower():
-                    should_keep = False
-                    removed.append(project['name'])
-                    break
-                    
-        if should_keep:
+    for i, project in enumerate(config['projects'], 1):
+        if i in target_indices or project['name'].lower() in target_names:
+            removed.append(project['name'])
+        else:
             remaining_projects.append(project)
     
     if removed:
@@ -253,27 +340,36 @@ def remove_projects(config, targets):
         print(f"\n✅ Removed projects: {', '.join(removed)}")
     else:
         print("\n⚠️ No matching projects found.")
+    return bool(removed)
+
+# Accepted confirmation replies
+_YESNO = {'y': True, 'yes': True, 'n': False, 'no': False}
 
 def confirm_action(message):
     """Ask for user confirmation."""
     while True:
-        response = input(f"\n{message} (y/n): ").lower()
-        if response in ['y', 'yes']:
-            return True
-        if response in ['n', 'no']:
-            return False
+        answer = _YESNO.get(input(f"\n{message} (y/n): ").strip().lower())
+        if answer is not None:
+            return answer
+
+# Branch and clone suffixes stripped from directory names, checked in order
+_NAME_SUFFIXES = ('-main', '-master', '-dev', '-development', '.git')
+_PATH_SEPARATORS = os.sep + (os.altsep or '')
 
 def get_project_name(project_path):
-    """Get project name from directory name, with some cleanup."""
+    """Get project name from directory name, with some cleanup.
+    
+    project_path is expected to be normalized already (the caller passes
+    an os.path.abspath result), so only trailing separators are dropped.
+    """
     # Get the base directory name
-    base_name = os.path.basename(os.path.normpath(project_path))
+    base_name = os.path.basename(project_path.rstrip(_PATH_SEPARATORS))
     
-    # Clean up common suffixes
+    # Clean up common suffixes; a single endswith call tries them all
     name = base_name.lower()
-    for suffix in ['-main', '-master', '-dev', '-development', '.git']:
-        if name.endswith(suffix):
-            base_name = base_name[:-len(suffix)]
-            break
+    if name.endswith(_NAME_SUFFIXES):
+        suffix = next(s for s in _NAME_SUFFIXES if name.endswith(s))
+        base_name = base_name[:-len(suffix)]
     
     # Convert to title case and replace special characters
     words = base_name.replace('-', ' ').replace('_', ' ').split()